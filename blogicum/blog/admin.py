@@ -1,9 +1,45 @@
 from django.contrib import admin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.admin import UserAdmin
+from django.http import StreamingHttpResponse
 
-from .models import Category, Location, Post, Comment
+from .filters import AutocompleteFilter, AutocompleteFilterAdmin
+from .models import Category, Comment, ImageTask, Location, Post
+from .paginators import EstimatedCountPaginator
+from .search import search
+from .streaming import export_lines, export_rows
 
+User = get_user_model()
 
-class PostAdmin(admin.ModelAdmin):
+
+def username_prefix(term):
+    """Поиск по началу логина, который идёт по индексу, а не LIKE."""
+    return {'username__gte': term, 'username__lt': term + '\uffff'}
+
+
+def export_response(queryset, export_format, content_type):
+    model = queryset.model
+    response = StreamingHttpResponse(
+        export_lines(model, export_rows(queryset.order_by('pk')),
+                     export_format),
+        content_type=content_type,
+    )
+    response['Content-Disposition'] = (
+        f'attachment; filename="{model._meta.model_name}s.{export_format}"')
+    return response
+
+
+@admin.action(description='Выгрузить выбранные в JSONL')
+def export_jsonl(modeladmin, request, queryset):
+    return export_response(queryset, 'jsonl', 'application/x-ndjson')
+
+
+@admin.action(description='Выгрузить выбранные в CSV')
+def export_csv(modeladmin, request, queryset):
+    return export_response(queryset, 'csv', 'text/csv')
+
+
+class PostAdmin(AutocompleteFilterAdmin):
     list_display = (
         'title',
         'text',
@@ -16,20 +52,103 @@ class PostAdmin(admin.ModelAdmin):
     list_editable = (
         'is_published',
     )
+    list_select_related = (
+        'author',
+        'location',
+    )
     search_fields = (
         'title',
-        'location',
         'text',
-        'author',
     )
     list_filter = (
         'is_published',
-        'location',
+        ('location', AutocompleteFilter),
+        ('author', AutocompleteFilter),
+    )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = (
+        export_jsonl,
+        export_csv,
+    )
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return search(queryset, search_term), False
+
+
+class CommentAdmin(AutocompleteFilterAdmin):
+    list_display = (
+        'text',
+        'post',
         'author',
+        'created_at',
+    )
+    list_select_related = (
+        'post',
+        'author',
+    )
+    search_fields = (
+        'author__username',
+    )
+    list_filter = (
+        ('author', AutocompleteFilter),
+    )
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    actions = (
+        export_jsonl,
+        export_csv,
+    )
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if search_term.isdigit():
+            return queryset.filter(post_id=search_term), False
+        if search_term:
+            return queryset.filter(author__in=User.objects.filter(
+                **username_prefix(search_term))), False
+        return queryset, False
+
+
+class LocationAdmin(admin.ModelAdmin):
+    search_fields = (
+        'name',
+    )
+
+
+class BlogUserAdmin(UserAdmin):
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        return queryset.filter(**username_prefix(search_term)), False
+
+
+class ImageTaskAdmin(admin.ModelAdmin):
+    list_display = (
+        'image_name',
+        'post',
+        'status',
+        'attempts',
+        'run_after',
+        'updated_at',
+    )
+    list_filter = (
+        'status',
+    )
+    readonly_fields = (
+        'last_error',
     )
 
 
 admin.site.register(Post, PostAdmin)
 admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Comment)
+admin.site.register(Location, LocationAdmin)
+admin.site.register(Comment, CommentAdmin)
+admin.site.register(ImageTask, ImageTaskAdmin)
+admin.site.unregister(User)
+admin.site.register(User, BlogUserAdmin)
@@ -0,0 +1,250 @@
+import hashlib
+from calendar import timegm
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.http import Http404, JsonResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.functional import cached_property
+from django.utils.http import (
+    http_date, parse_http_date_safe, quote_etag, urlencode
+)
+from django.views import View
+
+from .cache import (
+    FEED, GLOBAL, author_scope, category_scope, page_cache_key, post_scope
+)
+from .config import API_MAX_PAGE_SIZE, PAGE_CACHE_TIMEOUT, PAGINATE_POST
+from .models import Category, Post
+from .paginators import cursor_page
+from .utils import anotate, select
+
+User = get_user_model()
+
+POST_FIELDS = {
+    'id': lambda post, request: post.pk,
+    'title': lambda post, request: post.title,
+    'text': lambda post, request: post.text,
+    'pub_date': lambda post, request: post.pub_date,
+    'author': lambda post, request: post.author.username,
+    'category': lambda post, request: post.category.slug,
+    'location': lambda post, request: (
+        post.location.name if post.location and post.location.is_published
+        else None),
+    'image': lambda post, request: (
+        request.build_absolute_uri(post.image.url)
+        if post.image and post.image_ready else None),
+    'comment_count': lambda post, request: post.comment_count,
+}
+COMMENT_FIELDS = {
+    'id': lambda comment, request: comment.pk,
+    'text': lambda comment, request: comment.text,
+    'author': lambda comment, request: comment.author.username,
+    'created_at': lambda comment, request: comment.created_at,
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+class ApiView(View):
+    """JSON-ответ из кэша страниц с ETag по содержимому и Last-Modified.
+
+    Подклассы задают области кэша, дату последнего изменения и метод
+    get_data(), возвращающий данные ответа. ETag зависит только от ответа,
+    поэтому не меняется со сменой шага публикации и совпадает у всех
+    процессов.
+    """
+
+    fields = POST_FIELDS
+
+    def get_cache_scopes(self):
+        return (FEED,)
+
+    def get_last_modified(self):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        key = page_cache_key(request, self.get_cache_scopes())
+        response = cache.get(key)
+        if response is None:
+            try:
+                response = self.render()
+            except ApiError as error:
+                return JsonResponse({'error': str(error)}, status=400)
+            except Http404 as error:
+                return JsonResponse({'error': str(error)}, status=404)
+            cache.set(key, response, PAGE_CACHE_TIMEOUT)
+        return get_conditional_response(
+            request, etag=response['ETag'],
+            last_modified=parse_http_date_safe(
+                response.get('Last-Modified', '')),
+            response=response)
+
+    def render(self):
+        response = JsonResponse(
+            self.get_data(), json_dumps_params={'ensure_ascii': False})
+        response['ETag'] = quote_etag(
+            hashlib.md5(response.content).hexdigest())
+        last_modified = self.get_last_modified()
+        if last_modified:
+            response['Last-Modified'] = http_date(
+                timegm(last_modified.utctimetuple()))
+        return response
+
+    @cached_property
+    def requested_fields(self):
+        """Поля из ?fields=title,pub_date или все доступные."""
+        value = self.request.GET.get('fields')
+        if not value:
+            return tuple(self.fields)
+        requested = tuple(dict.fromkeys(value.split(',')))
+        unknown = set(requested) - set(self.fields)
+        if unknown:
+            raise ApiError(
+                f'Неизвестные поля: {", ".join(sorted(unknown))}.')
+        return requested
+
+    def serialize(self, obj):
+        return {name: self.fields[name](obj, self.request)
+                for name in self.requested_fields}
+
+    def page_size(self):
+        try:
+            limit = int(self.request.GET.get('limit', PAGINATE_POST))
+        except ValueError:
+            raise ApiError('Параметр limit должен быть числом.')
+        return max(1, min(limit, API_MAX_PAGE_SIZE))
+
+    def paginate(self, queryset, key='pub_date', descending=True):
+        page = cursor_page(
+            queryset, self.page_size(),
+            after=self.request.GET.get('after'),
+            before=self.request.GET.get('before'),
+            key=key, descending=descending)
+        return {
+            'results': [self.serialize(obj) for obj in page],
+            'next': self.page_url('after', page.next_cursor),
+            'previous': self.page_url('before', page.previous_cursor),
+        }
+
+    def page_url(self, name, value):
+        if value is None:
+            return None
+        params = self.request.GET.copy()
+        params.pop('after', None)
+        params.pop('before', None)
+        params[name] = value
+        return self.request.build_absolute_uri(
+            f'{self.request.path}?{params.urlencode()}')
+
+
+class PostListApiView(ApiView):
+
+    def get_cache_scopes(self):
+        params = self.request.GET
+        scopes = []
+        if 'category' in params:
+            scopes.append(category_scope(params['category']))
+        if 'author' in params:
+            scopes.append(author_scope(params['author']))
+        return scopes or (FEED,)
+
+    def get_queryset(self):
+        queryset = select(Post)
+        if 'category' in self.request.GET:
+            queryset = queryset.filter(
+                category__slug=self.request.GET['category'])
+        if 'author' in self.request.GET:
+            queryset = queryset.filter(
+                author__username=self.request.GET['author'])
+        return queryset
+
+    def get_last_modified(self):
+        return self.get_queryset().order_by('-pub_date').values_list(
+            'pub_date', flat=True).first()
+
+    def get_data(self):
+        queryset = anotate(self.get_queryset())
+        if 'text' not in self.requested_fields:
+            queryset = queryset.defer('text')
+        return self.paginate(queryset)
+
+
+class PostApiView(ApiView):
+
+    def get_cache_scopes(self):
+        return (post_scope(self.kwargs['post_id']),)
+
+    @cached_property
+    def post(self):
+        return get_object_or_404(
+            select(Post), pk=self.kwargs['post_id'])
+
+    def get_last_modified(self):
+        newest_comment = self.post.comments.order_by(
+            '-created_at').values_list('created_at', flat=True).first()
+        return max(filter(None, (self.post.pub_date, newest_comment)))
+
+    def get_data(self):
+        data = self.serialize(self.post)
+        data['comments'] = self.request.build_absolute_uri(
+            reverse('blog:api_comments', args=(self.post.pk,)))
+        return data
+
+
+class CommentListApiView(PostApiView):
+    fields = COMMENT_FIELDS
+
+    def get_data(self):
+        return self.paginate(
+            self.post.comments.select_related('author'),
+            key='created_at', descending=False)
+
+
+class CategoryListApiView(ApiView):
+    fields = {
+        'slug': lambda category, request: category.slug,
+        'title': lambda category, request: category.title,
+        'description': lambda category, request: category.description,
+    }
+
+    def get_cache_scopes(self):
+        return (GLOBAL,)
+
+    def get_data(self):
+        categories = Category.objects.filter(is_published=True)
+        return {'results': [self.serialize(category)
+                            for category in categories.order_by('title')]}
+
+
+class ProfileApiView(ApiView):
+    fields = {
+        'username': lambda user, request: user.username,
+        'first_name': lambda user, request: user.first_name,
+        'last_name': lambda user, request: user.last_name,
+        'post_count': lambda user, request: user.post_count,
+    }
+
+    def get_cache_scopes(self):
+        return (author_scope(self.kwargs['username']),)
+
+    @cached_property
+    def posts(self):
+        return select(Post).filter(author__username=self.kwargs['username'])
+
+    def get_last_modified(self):
+        return self.posts.order_by('-pub_date').values_list(
+            'pub_date', flat=True).first()
+
+    def get_data(self):
+        user = get_object_or_404(User, username=self.kwargs['username'])
+        user.post_count = self.posts.count()
+        data = self.serialize(user)
+        query = urlencode({'author': user.username})
+        data['posts'] = self.request.build_absolute_uri(
+            f'{reverse("blog:api_posts")}?{query}')
+        return data
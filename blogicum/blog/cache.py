@@ -0,0 +1,69 @@
+import hashlib
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+
+from .models import Category
+from .utils import publication_bucket
+
+User = get_user_model()
+
+# Поколение, общее для всех страниц: сдвигается при изменениях, которые
+# затрагивают весь сайт (категории, местоположения, массовые обновления).
+GLOBAL = 'global'
+FEED = 'feed'
+
+
+def category_scope(slug):
+    return f'category:{slug}'
+
+
+def author_scope(username):
+    return f'author:{username}'
+
+
+def post_scope(post_id):
+    return f'post:{post_id}'
+
+
+def _generation_key(scope):
+    return f'blog:gen:{scope}'
+
+
+def get_generations(*scopes):
+    keys = [_generation_key(scope) for scope in (GLOBAL, *scopes)]
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, time.time_ns(), timeout=None)
+            generations[key] = cache.get(key)
+    return '.'.join(str(generations[key]) for key in keys)
+
+
+def bump_generations(*scopes):
+    for scope in scopes:
+        key = _generation_key(scope)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, time.time_ns(), timeout=None)
+
+
+def page_cache_key(request, scopes):
+    path = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return (f'blog:page:{get_generations(*scopes)}:'
+            f'{publication_bucket()}:{path}')
+
+
+def bump_post_generations(post_ids, category_ids, author_ids):
+    slugs = Category.objects.filter(
+        pk__in=category_ids).values_list('slug', flat=True)
+    usernames = User.objects.filter(
+        pk__in=author_ids).values_list('username', flat=True)
+    bump_generations(
+        FEED,
+        *(post_scope(post_id) for post_id in post_ids),
+        *(category_scope(slug) for slug in slugs),
+        *(author_scope(username) for username in usernames),
+    )
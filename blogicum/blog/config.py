@@ -1,6 +1,56 @@
-from django.utils import timezone
+PAGINATE_POST = 10
 
+# Сколько комментариев показывать на странице публикации и подгружать
+# по кнопке «Показать ещё».
+PAGINATE_COMMENTS = 50
 
-DATETIME_NOW = timezone.now()
+# Шаг (в секундах), с которым округляется текущее время при отборе
+# опубликованных постов: внутри одного шага выборка не меняется.
+PUBLICATION_TIME_STEP = 60
 
-PAGINATE_POST = 10
+# Глубже этой страницы нумерованная пагинация не работает: дальше лента
+# листается по курсору (?after=/?before=), без COUNT(*) и OFFSET.
+PAGINATE_MAX_PAGE = 50
+
+# Сколько номеров страниц показывать вокруг текущей и по краям пагинатора.
+PAGINATE_ON_EACH_SIDE = 2
+PAGINATE_ON_ENDS = 1
+
+# Время жизни (в секундах) закэшированных страниц для анонимных
+# пользователей и фрагментов карточек публикаций.
+PAGE_CACHE_TIMEOUT = 60 * 5
+
+# Ширины (в пикселях) уменьшенных копий изображений публикаций.
+IMAGE_RENDITION_WIDTHS = (320, 640, 1280)
+IMAGE_RENDITION_QUALITY = 85
+
+# Очередь обработки фото: число попыток, пауза перед повтором (умножается
+# на номер попытки) и время, после которого зависшая задача перезапускается.
+IMAGE_TASK_MAX_ATTEMPTS = 3
+IMAGE_TASK_RETRY_DELAY = 60
+IMAGE_TASK_STALE_AFTER = 60 * 10
+
+# Ограничения на загружаемые фото публикаций. Фото больше
+# IMAGE_MAX_DIMENSION по любой стороне уменьшаются; все фото
+# перекодируются в JPEG (или WebP, если есть прозрачность) без EXIF.
+IMAGE_MAX_UPLOAD_SIZE = 10 * 1024 * 1024
+IMAGE_MAX_PIXELS = 50_000_000
+IMAGE_MAX_DIMENSION = 2560
+IMAGE_ALLOWED_FORMATS = ('JPEG', 'PNG', 'WEBP', 'GIF')
+IMAGE_UPLOAD_QUALITY = 85
+
+# До этого числа записей админка считает результаты точно; больше —
+# показывает оценку и не перебирает всю таблицу ради COUNT(*).
+ADMIN_COUNT_LIMIT = 10_000
+
+# Наибольший размер страницы, который клиент API может запросить ?limit=.
+API_MAX_PAGE_SIZE = 100
+
+# Сколько последних публикаций попадает в RSS/Atom и сколько слов текста
+# показывается в анонсе.
+FEED_ITEMS = 20
+FEED_SUMMARY_WORDS = 60
+
+# Сколько id публикаций (и пользователей) покрывает одна часть карты сайта;
+# протокол sitemaps допускает не больше 50 000 адресов в файле.
+SITEMAP_SHARD_SIZE = 50_000
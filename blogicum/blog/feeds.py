@@ -0,0 +1,130 @@
+import hashlib
+
+from django.contrib.auth import get_user_model
+from django.contrib.syndication.views import Feed
+from django.core.cache import cache
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.cache import get_conditional_response
+from django.utils.feedgenerator import Atom1Feed
+from django.utils.http import parse_http_date_safe, quote_etag
+from django.utils.text import Truncator
+
+from .cache import FEED, author_scope, category_scope, page_cache_key
+from .config import FEED_ITEMS, FEED_SUMMARY_WORDS, PAGE_CACHE_TIMEOUT
+from .models import Category, Post
+from .utils import anotate, select
+
+User = get_user_model()
+
+
+class PostFeed(Feed):
+    title = 'Блогикум'
+    description = 'Новые публикации'
+
+    def link(self):
+        return reverse('blog:index')
+
+    def items(self):
+        return anotate(select(Post))[:FEED_ITEMS]
+
+    def item_title(self, post):
+        return post.title
+
+    def item_description(self, post):
+        return Truncator(post.text).words(FEED_SUMMARY_WORDS)
+
+    def item_link(self, post):
+        return reverse('blog:post_detail', args=(post.pk,))
+
+    def item_pubdate(self, post):
+        return post.pub_date
+
+    def item_author_name(self, post):
+        return post.author.username
+
+    def item_categories(self, post):
+        return (post.category.title,)
+
+
+class CategoryFeed(PostFeed):
+
+    def get_object(self, request, category):
+        return get_object_or_404(Category, slug=category, is_published=True)
+
+    def title(self, category):
+        return f'Блогикум: {category.title}'
+
+    def description(self, category):
+        return category.description
+
+    def link(self, category):
+        return reverse('blog:category_posts', args=(category.slug,))
+
+    def items(self, category):
+        return anotate(select(Post).filter(category=category))[:FEED_ITEMS]
+
+
+class AuthorFeed(PostFeed):
+
+    def get_object(self, request, username):
+        return get_object_or_404(User, username=username)
+
+    def title(self, author):
+        return f'Блогикум: {author.username}'
+
+    def description(self, author):
+        return f'Публикации пользователя {author.username}'
+
+    def link(self, author):
+        return reverse('blog:profile', args=(author.username,))
+
+    def items(self, author):
+        return anotate(select(Post).filter(author=author))[:FEED_ITEMS]
+
+
+class AtomPostFeed(PostFeed):
+    feed_type = Atom1Feed
+    subtitle = PostFeed.description
+
+
+class AtomCategoryFeed(CategoryFeed):
+    feed_type = Atom1Feed
+    subtitle = CategoryFeed.description
+
+
+class AtomAuthorFeed(AuthorFeed):
+    feed_type = Atom1Feed
+    subtitle = AuthorFeed.description
+
+
+def cached_feed(feed, get_scopes=lambda: (FEED,)):
+    """Отдаёт ленту из кэша, пока не изменились её публикации.
+
+    Лента рисуется заново только после сдвига поколений областей кэша;
+    клиенты с If-None-Match или If-Modified-Since получают 304.
+    """
+    def view(request, **kwargs):
+        key = page_cache_key(request, get_scopes(**kwargs))
+        response = cache.get(key)
+        if response is None:
+            response = feed(request, **kwargs)
+            response['ETag'] = quote_etag(
+                hashlib.md5(response.content).hexdigest())
+            cache.set(key, response, PAGE_CACHE_TIMEOUT)
+        return get_conditional_response(
+            request, etag=response['ETag'],
+            last_modified=parse_http_date_safe(
+                response.get('Last-Modified', '')),
+            response=response)
+    return view
+
+
+def category_feed(feed):
+    return cached_feed(
+        feed, lambda category: (category_scope(category),))
+
+
+def author_feed(feed):
+    return cached_feed(
+        feed, lambda username: (author_scope(username),))
@@ -0,0 +1,56 @@
+from django import forms
+from django.contrib import admin
+from django.contrib.admin.widgets import AutocompleteSelect
+
+
+class AutocompleteFilter(admin.FieldListFilter):
+    """Фильтр по внешнему ключу с поиском вместо списка всех значений."""
+
+    template = 'admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin,
+                 field_path):
+        self.lookup_kwarg = f'{field_path}__{field.target_field.name}__exact'
+        self.lookup_val = params.get(self.lookup_kwarg)
+        super().__init__(
+            field, request, params, model, model_admin, field_path)
+        self.widget = forms.ModelChoiceField(
+            queryset=field.remote_field.model._default_manager.all(),
+            widget=AutocompleteSelect(field, model_admin.admin_site),
+            required=False,
+        ).widget
+
+    def expected_parameters(self):
+        return [self.lookup_kwarg]
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        yield {
+            'selected': self.lookup_val is None,
+            'query_string': changelist.get_query_string(
+                remove=[self.lookup_kwarg]),
+            'display': 'Все',
+        }
+
+    def render_widget(self):
+        return self.widget.render(
+            self.lookup_kwarg, self.lookup_val,
+            attrs={'id': f'filter_{self.lookup_kwarg}',
+                   'data-filter': self.lookup_kwarg},
+        )
+
+
+class AutocompleteFilterAdmin(admin.ModelAdmin):
+    """Подключает скрипты select2 для фильтров AutocompleteFilter."""
+
+    @property
+    def media(self):
+        media = super().media
+        for item in self.list_filter:
+            if isinstance(item, tuple) and issubclass(
+                    item[1], AutocompleteFilter):
+                field = self.model._meta.get_field(item[0])
+                media += AutocompleteSelect(field, self.admin_site).media
+        return media
@@ -0,0 +1,131 @@
+import re
+from io import BytesIO
+from pathlib import PurePosixPath
+from tempfile import SpooledTemporaryFile
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile, File
+from django.db import transaction
+from PIL import Image, ImageOps
+
+from .config import (
+    IMAGE_ALLOWED_FORMATS, IMAGE_MAX_DIMENSION, IMAGE_MAX_PIXELS,
+    IMAGE_MAX_UPLOAD_SIZE, IMAGE_RENDITION_QUALITY, IMAGE_RENDITION_WIDTHS,
+    IMAGE_UPLOAD_QUALITY
+)
+from .models import Post
+from .storage import post_image_storage
+
+# Заглушка, которая показывается, пока фото ждёт обработки в очереди.
+IMAGE_PLACEHOLDER = (
+    'data:image/svg+xml,'
+    '%3Csvg xmlns=%22http://www.w3.org/2000/svg%22 viewBox=%220 0 16 9%22%3E'
+    '%3Crect width=%2216%22 height=%229%22 fill=%22%23dee2e6%22/%3E%3C/svg%3E'
+)
+
+
+def rendition_name(name, width):
+    path = PurePosixPath(name)
+    return str(path.parent / 'renditions' / f'{path.stem}_{width}w.jpg')
+
+
+def rendition_widths(name):
+    """Ширины уменьшенных копий фото, которые лежат в хранилище."""
+    path = PurePosixPath(rendition_name(name, 0))
+    pattern = re.compile(
+        rf'{re.escape(PurePosixPath(name).stem)}_(\d+)w\.jpg')
+    try:
+        _, files = post_image_storage.listdir(str(path.parent))
+    except FileNotFoundError:
+        return []
+    return sorted(int(match[1]) for match in map(pattern.fullmatch, files)
+                  if match)
+
+
+def flatten(image):
+    """Накладывает прозрачные участки фото на белый фон."""
+    if image.mode == 'RGB':
+        return image
+    image = image.convert('RGBA')
+    background = Image.new('RGBA', image.size, 'white')
+    return Image.alpha_composite(background, image).convert('RGB')
+
+
+def make_renditions(image):
+    with image.open('rb') as file:
+        original = flatten(ImageOps.exif_transpose(Image.open(file)))
+    # Последняя копия в полную ширину: так srcset не ограничивает
+    # широкие экраны самой большой уменьшенной копией.
+    widths = [width for width in IMAGE_RENDITION_WIDTHS
+              if width < original.width] + [original.width]
+    for width in widths:
+        rendition = original.copy()
+        rendition.thumbnail((width, original.height))
+        buffer = BytesIO()
+        rendition.save(buffer, 'JPEG', quality=IMAGE_RENDITION_QUALITY,
+                       optimize=True, progressive=True)
+        image.storage.save_as(rendition_name(image.name, width),
+                              ContentFile(buffer.getvalue()))
+    return ','.join(map(str, widths))
+
+
+def release_image(name):
+    if not name or Post.objects.filter(image=name).exists():
+        return False
+    for width in rendition_widths(name):
+        post_image_storage.delete(rendition_name(name, width))
+    # Копии создаются заново, а исходное фото нет: перед его удалением
+    # ссылки проверяются ещё раз, строки блокируются до конца транзакции.
+    with transaction.atomic():
+        if Post.objects.select_for_update().filter(image=name).exists():
+            return False
+        post_image_storage.delete(name)
+    return True
+
+
+def prepare_upload(upload):
+    if upload.size > IMAGE_MAX_UPLOAD_SIZE:
+        raise ValidationError(
+            'Размер фото не должен превышать '
+            f'{IMAGE_MAX_UPLOAD_SIZE // (1024 * 1024)} МБ.')
+    upload.seek(0)
+    image = Image.open(upload)
+    if image.format not in IMAGE_ALLOWED_FORMATS:
+        raise ValidationError(
+            'Допустимые форматы фото: '
+            f'{", ".join(IMAGE_ALLOWED_FORMATS)}.')
+    if image.width * image.height > IMAGE_MAX_PIXELS:
+        raise ValidationError('Слишком большое разрешение фото.')
+    image.draft('RGB', (IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+    image = ImageOps.exif_transpose(image)
+    image.thumbnail((IMAGE_MAX_DIMENSION, IMAGE_MAX_DIMENSION))
+    output = SpooledTemporaryFile(
+        max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE)
+    if image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info:
+        image.convert('RGBA').save(output, 'WEBP',
+                                   quality=IMAGE_UPLOAD_QUALITY)
+        extension = 'webp'
+    else:
+        image.convert('RGB').save(output, 'JPEG',
+                                  quality=IMAGE_UPLOAD_QUALITY,
+                                  optimize=True, progressive=True)
+        extension = 'jpg'
+    output.seek(0)
+    return File(output, name=f'{PurePosixPath(upload.name).stem}.{extension}')
+
+
+def image_src(post):
+    if not post.image_ready:
+        return IMAGE_PLACEHOLDER
+    return post.image.url
+
+
+def image_srcset(post):
+    if not post.image or not post.image_renditions:
+        return ''
+    storage = post.image.storage
+    return ', '.join(
+        f'{storage.url(rendition_name(post.image.name, width))} {width}w'
+        for width in post.image_renditions.split(',')
+    )
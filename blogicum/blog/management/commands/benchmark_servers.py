@@ -0,0 +1,122 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import cycle, islice
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand, CommandError
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+
+from blog.models import Post
+
+HOST = '127.0.0.1'
+# Адрес не из INTERNAL_IPS, чтобы не включалась панель отладки.
+CLIENT = '192.0.2.1'
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает пропускную способность Django под WSGI и ASGI на '
+            'главной, категории, публикации и профиле. Запросы идут к '
+            'обработчикам в этом же процессе, без сети. Вид представлений '
+            'задаёт настройка ASYNC_READ_VIEWS.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*',
+                            help='Адреса страниц; по умолчанию четыре ленты.')
+        parser.add_argument('--requests', type=int, default=5000)
+        parser.add_argument('--concurrency', type=int, default=500)
+        parser.add_argument(
+            '--cold', action='store_true',
+            help='Очищать кэш перед каждым запросом.')
+
+    def handle(self, *args, **options):
+        paths = options['paths'] or self.default_paths()
+        paths = list(islice(cycle(paths), options['requests']))
+        self.cold = options['cold']
+        self.stdout.write(
+            'Асинхронные представления: '
+            f'{"да" if settings.ASYNC_READ_VIEWS else "нет"}')
+        # Замеры без панели отладки и DEBUG, как на боевом сервере.
+        with override_settings(
+                DEBUG=False, ALLOWED_HOSTS=[HOST],
+                MIDDLEWARE=[name for name in settings.MIDDLEWARE
+                            if not name.startswith('debug_toolbar.')]):
+            for title, run in (('WSGI', self.run_wsgi),
+                               ('ASGI', self.run_asgi)):
+                cache.clear()
+                seconds, statuses = run(paths, options['concurrency'])
+                self.stdout.write(self.style.SUCCESS(
+                    f'{title}: {len(paths)} запросов за {seconds:.2f} с, '
+                    f'{len(paths) / seconds:.0f} запросов/с, '
+                    f'ответы {dict(statuses)}'))
+
+    def default_paths(self):
+        post = Post.objects.select_related('category', 'author').filter(
+            is_published=True, category__is_published=True).order_by(
+            '-pk').first()
+        if post is None:
+            raise CommandError('Нет опубликованных публикаций.')
+        return [
+            reverse('blog:index'),
+            reverse('blog:category_posts', args=(post.category.slug,)),
+            reverse('blog:post_detail', args=(post.pk,)),
+            reverse('blog:profile', args=(post.author.username,)),
+        ]
+
+    def run_wsgi(self, paths, concurrency):
+        handler = WSGIHandler()
+        factory = RequestFactory(SERVER_NAME=HOST, REMOTE_ADDR=CLIENT)
+        statuses = Counter()
+
+        def request(path):
+            if self.cold:
+                cache.clear()
+            status = []
+            response = handler(
+                factory.get(path).environ,
+                lambda value, headers: status.append(value))
+            for _ in response:
+                pass
+            response.close()
+            statuses[int(status[0].split()[0])] += 1
+
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(request, paths))
+        return time.perf_counter() - start, statuses
+
+    def run_asgi(self, paths, concurrency):
+        application = ASGIHandler()
+        statuses = Counter()
+
+        async def receive():
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+        async def request(path, semaphore):
+            async def send(message):
+                if message['type'] == 'http.response.start':
+                    statuses[message['status']] += 1
+
+            async with semaphore:
+                if self.cold:
+                    cache.clear()
+                await application({
+                    'type': 'http', 'http_version': '1.1', 'method': 'GET',
+                    'scheme': 'http', 'path': path, 'query_string': b'',
+                    'root_path': '', 'headers': [(b'host', HOST.encode())],
+                    'client': (CLIENT, 50000), 'server': (HOST, 80),
+                }, receive, send)
+
+        async def run():
+            semaphore = asyncio.Semaphore(concurrency)
+            start = time.perf_counter()
+            await asyncio.gather(*(request(path, semaphore)
+                                   for path in paths))
+            return time.perf_counter() - start
+
+        return asyncio.run(run()), statuses
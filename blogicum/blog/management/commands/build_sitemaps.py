@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog.sitemaps import build_sitemaps
+
+
+class Command(BaseCommand):
+    help = ('Перестраивает изменившиеся части карты сайта и её индекс '
+            'в SITEMAP_ROOT.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url', default=settings.SITE_URL,
+            help='Адрес сайта для ссылок в карте.')
+        parser.add_argument(
+            '--full', action='store_true',
+            help='Перестроить все части, а не только изменившиеся.')
+
+    def handle(self, *args, **options):
+        rebuilt = build_sitemaps(
+            settings.SITEMAP_ROOT, options['base_url'], options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Перестроено частей карты сайта: {len(rebuilt)}'))
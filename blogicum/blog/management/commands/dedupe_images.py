@@ -0,0 +1,59 @@
+import posixpath
+
+from django.core.management.base import BaseCommand
+
+from blog.images import rendition_name, rendition_widths
+from blog.models import Post
+from blog.storage import content_hash, post_image_storage
+
+
+class Command(BaseCommand):
+    help = ('Переименовывает фото публикаций по хэшу содержимого и удаляет'
+            ' дубликаты.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только показать, сколько места освободится.')
+
+    def move(self, old_name, new_name, dry_run):
+        storage = post_image_storage
+        if not storage.exists(old_name) or old_name == new_name:
+            return 0
+        if storage.exists(new_name):
+            freed = storage.size(old_name)
+            if not dry_run:
+                storage.delete(old_name)
+            return freed
+        if not dry_run:
+            with storage.open(old_name) as content:
+                storage.save_as(new_name, content)
+            storage.delete(old_name)
+        return 0
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        storage = post_image_storage
+        upload_to = Post._meta.get_field('image').upload_to
+        names = list(Post.objects.exclude(image='').order_by().values_list(
+            'image', flat=True).distinct())
+        renamed = freed = 0
+        for name in names:
+            if not storage.exists(name):
+                continue
+            with storage.open(name) as content:
+                new_name = storage.hashed_name(
+                    posixpath.join(upload_to, posixpath.basename(name)),
+                    content_hash(content))
+            if new_name == name:
+                continue
+            for width in rendition_widths(name):
+                freed += self.move(rendition_name(name, width),
+                                   rendition_name(new_name, width), dry_run)
+            freed += self.move(name, new_name, dry_run)
+            if not dry_run:
+                Post.objects.filter(image=name).update(image=new_name)
+            renamed += 1
+        self.stdout.write(self.style.SUCCESS(
+            f'Переименовано файлов: {renamed}, '
+            f'освобождено: {freed // 1024} КБ'))
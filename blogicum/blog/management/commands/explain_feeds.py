@@ -0,0 +1,111 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from blog.config import PAGINATE_POST
+from blog.models import Category, Post
+from blog.utils import anotate, select
+
+User = get_user_model()
+
+# Индексы лент, без которых снимается план «до».
+FEED_INDEXES = (
+    'post_published_feed_idx',
+    'post_category_feed_idx',
+    'post_author_feed_idx',
+)
+SEED_BATCH_SIZE = 2000
+SEED_AUTHORS = 50
+SEED_CATEGORIES = 20
+
+
+class Command(BaseCommand):
+    help = ('Сравнивает планы и время запросов лент главной, категории и '
+            'профиля без индексов лент и с ними. С --seed сначала создаёт '
+            'тестовые публикации; они удаляются после замеров.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--seed', type=int, default=0,
+            help='Сколько тестовых публикаций создать на время замеров.')
+        parser.add_argument(
+            '--repeat', type=int, default=5,
+            help='Сколько раз выполнять запрос; выводится лучшее время.')
+
+    def handle(self, *args, **options):
+        # Тестовые публикации и удаление индексов откатываются вместе
+        # с транзакцией, база остаётся прежней.
+        with transaction.atomic():
+            if options['seed']:
+                self.seed(options['seed'])
+            self.compare(options['repeat'])
+            transaction.set_rollback(True)
+
+    def compare(self, repeat):
+        post = Post.objects.filter(category__isnull=False).order_by(
+            '-pk').first()
+        if post is None:
+            self.stdout.write('Нет публикаций с категорией.')
+            return
+        feeds = {
+            'Главная': anotate(select(Post)),
+            'Категория': anotate(select(Post).filter(
+                category=post.category_id)),
+            'Профиль': anotate(Post.objects.select_related(
+                'author', 'location', 'category').filter(
+                author=post.author_id)),
+        }
+        # В SQLite удаление индекса откатывается вместе с точкой сохранения.
+        with transaction.atomic():
+            with connection.cursor() as cursor:
+                for name in FEED_INDEXES:
+                    cursor.execute(
+                        f'DROP INDEX {connection.ops.quote_name(name)}')
+            self.explain('Без индексов лент', feeds, repeat)
+            transaction.set_rollback(True)
+        self.explain('С индексами лент', feeds, repeat)
+
+    def explain(self, title, feeds, repeat):
+        self.stdout.write(self.style.MIGRATE_HEADING(title))
+        for name, queryset in feeds.items():
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                list(queryset[:PAGINATE_POST])
+                timings.append(time.perf_counter() - start)
+            self.stdout.write(f'{name}: {min(timings) * 1000:.1f} мс')
+            self.stdout.write(queryset[:PAGINATE_POST].explain())
+
+    def seed(self, count):
+        # Фиксированное зерно: повторный запуск даёт те же данные.
+        rng = random.Random(0)
+        User.objects.bulk_create(
+            [User(username=f'seed_author_{number}')
+             for number in range(SEED_AUTHORS)], ignore_conflicts=True)
+        Category.objects.bulk_create(
+            [Category(title=f'Категория {number}', slug=f'seed-{number}',
+                      description='Тестовая категория', is_published=True)
+             for number in range(SEED_CATEGORIES)], ignore_conflicts=True)
+        authors = list(User.objects.filter(
+            username__startswith='seed_author_').values_list('pk', flat=True))
+        categories = list(Category.objects.filter(
+            slug__startswith='seed-').values_list('pk', flat=True))
+        now = timezone.now()
+        for start in range(0, count, SEED_BATCH_SIZE):
+            Post.objects.bulk_create([
+                Post(title=f'Тестовая публикация {number}', text='Текст',
+                     pub_date=now - timedelta(minutes=number),
+                     author_id=rng.choice(authors),
+                     category_id=rng.choice(categories),
+                     is_published=number % 10 != 0)
+                for number in range(start, min(start + SEED_BATCH_SIZE, count))
+            ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        self.stdout.write(self.style.SUCCESS(
+            f'Создано тестовых публикаций: {count}'))
@@ -0,0 +1,77 @@
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Comment, Post
+from blog.streaming import (
+    EXPORT_CHUNK_SIZE, EXPORT_FIELDS, EXPORT_FORMATS, export_lines,
+    export_rows, open_stream
+)
+
+MODELS = {'posts': Post, 'comments': Comment}
+
+
+class Command(BaseCommand):
+    help = ('Потоково выгружает публикации или комментарии в JSONL или CSV; '
+            'файл с расширением .gz сжимается gzip.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=MODELS)
+        parser.add_argument('output')
+        parser.add_argument(
+            '--format', choices=EXPORT_FORMATS,
+            help='По умолчанию определяется по расширению файла.')
+        parser.add_argument(
+            '--state',
+            help=('Файл с ключом (created_at, id) последней выгруженной '
+                  'записи: выгружаются только более новые, ключ '
+                  'обновляется после выгрузки.'))
+        parser.add_argument(
+            '--chunk-size', type=int, default=EXPORT_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        model = MODELS[options['model']]
+        export_format = options['format'] or (
+            'csv' if '.csv' in options['output'] else 'jsonl')
+        state_path = options['state'] and Path(options['state'])
+        state = self.read_state(state_path)
+        queryset = model.objects.order_by('created_at', 'pk')
+        last = state.get(model._meta.label_lower)
+        if last:
+            created_at = parse_datetime(last['created_at'])
+            # Нестрогая граница по дате позволяет искать по диапазону
+            # индекса: по одному условию с OR SQLite просматривает всё.
+            queryset = queryset.filter(created_at__gte=created_at).filter(
+                Q(created_at__gt=created_at)
+                | Q(created_at=created_at, pk__gt=last['id']))
+        self.exported, self.last_row = 0, None
+        rows = self.track(export_rows(queryset, options['chunk_size']))
+        with open_stream(options['output'], 'w') as file:
+            file.writelines(export_lines(model, rows, export_format))
+        if state_path and self.last_row:
+            created_at = self.last_row[
+                1 + EXPORT_FIELDS[model].index('created_at')]
+            state[model._meta.label_lower] = {
+                'created_at': created_at.isoformat(),
+                'id': self.last_row[0],
+            }
+            state_path.write_text(json.dumps(state, indent=2))
+        self.stdout.write(self.style.SUCCESS(
+            f'Выгружено записей: {self.exported}'))
+
+    def track(self, rows):
+        for row in rows:
+            self.exported += 1
+            self.last_row = row
+            yield row
+
+    def read_state(self, path):
+        if not path or not path.exists():
+            return {}
+        try:
+            return json.loads(path.read_text())
+        except ValueError as error:
+            raise CommandError(f'{path}: {error}')
@@ -0,0 +1,146 @@
+import time
+from contextlib import contextmanager
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from blog.models import Category, Comment, Location, Post
+from blog.search import index_posts
+from blog.streaming import read_records
+from blog.utils import recount_comments
+
+User = get_user_model()
+
+# Порядок важен: публикации ссылаются на категории и местоположения,
+# комментарии — на публикации.
+MODELS = {
+    'blog.category': Category,
+    'blog.location': Location,
+    'blog.post': Post,
+    'blog.comment': Comment,
+}
+
+
+@contextmanager
+def keep_created_at():
+    """Не даёт bulk_create заменить даты создания из выгрузки текущими."""
+    fields = [model._meta.get_field('created_at')
+              for model in MODELS.values()]
+    for field in fields:
+        field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field in fields:
+            field.auto_now_add = True
+
+
+class Command(BaseCommand):
+    help = ('Потоково загружает категории, местоположения, публикации и '
+            'комментарии из JSON (формат dumpdata) или JSONL, в том числе '
+            'сжатых gzip.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+')
+        parser.add_argument(
+            '--batch-size', type=int, default=2000,
+            help='Сколько записей одной модели вставлять за раз.')
+
+    def handle(self, *args, **options):
+        self.batch_size = options['batch_size']
+        self.batches = {model: [] for model in MODELS.values()}
+        self.imported = {model: 0 for model in MODELS.values()}
+        self.skipped = 0
+        # Известные первичные ключи для проверки внешних ключей и логины
+        # авторов для натуральных ключей вида ["username"].
+        self.known = {
+            model: set(model.objects.values_list('pk', flat=True).iterator())
+            for model in (User, Category, Location, Post)
+        }
+        self.usernames = None
+        self.started = time.monotonic()
+        with keep_created_at():
+            for path in options['paths']:
+                try:
+                    for record in read_records(path):
+                        self.add(record)
+                except (OSError, ValueError) as error:
+                    raise CommandError(f'{path}: {error}')
+            self.flush()
+        self.report(self.style.SUCCESS)
+
+    def add(self, record):
+        model = MODELS.get(record.get('model', '').lower())
+        if model is None:
+            self.skipped += 1
+            return
+        obj = self.build(model, record)
+        if obj is None:
+            self.skipped += 1
+            return
+        if model in self.known and obj.pk is not None:
+            self.known[model].add(obj.pk)
+        batch = self.batches[model]
+        batch.append(obj)
+        if len(batch) >= self.batch_size:
+            self.flush()
+            self.report()
+
+    def build(self, model, record):
+        if record.get('pk') is None:
+            return None
+        values = {}
+        for name, value in record.get('fields', {}).items():
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                continue
+            if field.is_relation and value is not None:
+                value = self.resolve(field, value)
+                if value is None and not field.null:
+                    return None
+            values[field.attname] = value
+        values.setdefault('created_at', timezone.now())
+        return model(pk=record.get('pk'), **values)
+
+    def resolve(self, field, value):
+        related = field.related_model
+        if isinstance(value, list):
+            if related is not User:
+                return None
+            if self.usernames is None:
+                self.usernames = dict(User.objects.values_list(
+                    User.USERNAME_FIELD, 'pk').iterator())
+            return self.usernames.get(value[0])
+        return value if value in self.known[related] else None
+
+    def flush(self):
+        for model, batch in self.batches.items():
+            if not batch:
+                continue
+            existing = set(model.objects.filter(
+                pk__in=[obj.pk for obj in batch]).values_list('pk', flat=True))
+            new = [obj for obj in batch if obj.pk not in existing]
+            with transaction.atomic():
+                model.objects.bulk_create(new)
+                if model is Post:
+                    index_posts(new)
+                if model is Comment and new:
+                    recount_comments(Post.objects.filter(
+                        pk__in={comment.post_id for comment in new}))
+            self.imported[model] += len(new)
+            self.skipped += len(batch) - len(new)
+            batch.clear()
+
+    def report(self, style=str):
+        elapsed = time.monotonic() - self.started
+        total = sum(self.imported.values())
+        counts = ', '.join(
+            f'{model._meta.label}: {count}'
+            for model, count in self.imported.items())
+        self.stdout.write(style(
+            f'{counts}; пропущено: {self.skipped}; '
+            f'{total / max(elapsed, 1e-6):.0f} записей/с'))
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.tasks import run_pending
+
+
+class Command(BaseCommand):
+    help = 'Обрабатывает очередь загруженных фото публикаций.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Обработать накопившиеся задачи и завершиться.')
+        parser.add_argument(
+            '--sleep', type=float, default=2,
+            help='Пауза в секундах, если очередь пуста.')
+
+    def handle(self, *args, **options):
+        while True:
+            processed = run_pending()
+            if processed:
+                self.stdout.write(f'Обработано фото: {processed}')
+            if options['once']:
+                return
+            time.sleep(options['sleep'])
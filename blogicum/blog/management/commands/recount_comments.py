@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from blog.cache import GLOBAL, bump_generations
+from blog.utils import recount_comments
+
+
+class Command(BaseCommand):
+    help = 'Пересчитывает количество комментариев у публикаций.'
+
+    def handle(self, *args, **options):
+        updated = recount_comments()
+        bump_generations(GLOBAL)
+        self.stdout.write(self.style.SUCCESS(
+            f'Обновлено публикаций: {updated}'))
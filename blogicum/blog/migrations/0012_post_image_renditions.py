@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-18 01:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_feed_indexes_tiebreak'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_renditions',
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name='Ширины уменьшенных копий фото'),
+        ),
+    ]
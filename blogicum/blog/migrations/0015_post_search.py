@@ -0,0 +1,48 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:05
+
+import re
+from itertools import islice
+
+import snowballstemmer
+from django.db import migrations
+
+CHUNK_SIZE = 2000
+WORD = re.compile(r'\w+')
+
+
+def fill_search_index(apps, schema_editor):
+    # Копия blog.search.stem_text на момент миграции: живой модуль может
+    # измениться и импортирует живую модель Post.
+    stemmer = snowballstemmer.stemmer('russian')
+
+    def stem_text(text):
+        words = WORD.findall(text.lower().replace('ё', 'е'))
+        return ' '.join(stemmer.stemWords(words))
+
+    Post = apps.get_model('blog', 'Post')
+    rows = (
+        (post.pk, stem_text(post.title), stem_text(post.text))
+        for post in Post.objects.only('title', 'text').iterator(
+            chunk_size=CHUNK_SIZE)
+    )
+    with schema_editor.connection.cursor() as cursor:
+        for chunk in iter(lambda: list(islice(rows, CHUNK_SIZE)), []):
+            cursor.executemany(
+                'INSERT INTO blog_post_search (rowid, title, text) '
+                'VALUES (%s, %s, %s)', chunk)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0014_content_addressed_images'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            "CREATE VIRTUAL TABLE blog_post_search USING fts5("
+            "title, text, tokenize='unicode61 remove_diacritics 0')",
+            'DROP TABLE blog_post_search',
+        ),
+        migrations.RunPython(fill_search_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 3.2.16 on 2026-10-18 02:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0016_export_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SitemapShard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('section', models.CharField(choices=[('posts', 'Публикации'), ('profiles', 'Профили'), ('categories', 'Категории')], max_length=16, verbose_name='Раздел')),
+                ('number', models.PositiveIntegerField(verbose_name='Номер')),
+                ('changed_at', models.DateTimeField(null=True, verbose_name='Изменено')),
+                ('generated_at', models.DateTimeField(null=True, verbose_name='Построено')),
+            ],
+            options={
+                'verbose_name': 'часть карты сайта',
+                'verbose_name_plural': 'Карта сайта',
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='sitemapshard',
+            constraint=models.UniqueConstraint(fields=('section', 'number'), name='sitemapshard_unique'),
+        ),
+    ]
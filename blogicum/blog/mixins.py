@@ -1,25 +1,30 @@
-from django.shortcuts import get_object_or_404, redirect
+from functools import update_wrapper
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+from django.shortcuts import redirect
 from django.urls import reverse, reverse_lazy
 from django.contrib.auth.mixins import LoginRequiredMixin
 
 
 from blog.models import Post, Comment
+from .cache import FEED, page_cache_key
+from .config import PAGE_CACHE_TIMEOUT, PAGINATE_COMMENTS
+from .paginators import CappedPaginator, cursor_page, encode_cursor
 
 
-class CommentMixin(LoginRequiredMixin):
-    model = Comment
-    template_name = 'blog/comment.html'
-    pk_url_kwarg = 'comment_id'
+class AuthorOnlyMixin(LoginRequiredMixin):
 
-    def get_context_data(self, **kwargs):
-        context = super().get_context_data(**kwargs)
-        context['comment'] = get_object_or_404(self.model,
-                                               id=self.kwargs['comment_id'])
-        return context
+    def get_queryset(self):
+        return super().get_queryset().select_related('author')
 
-    def get_success_url(self):
-        return reverse_lazy('blog:post_detail',
-                            kwargs={'post_id': self.kwargs['post_id']})
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_object'):
+            self._object = super().get_object()
+        return self._object
 
     def dispatch(self, request, *args, **kwargs):
         if self.get_object().author != request.user:
@@ -27,15 +32,113 @@ class CommentMixin(LoginRequiredMixin):
         return super().dispatch(request, *args, **kwargs)
 
 
-class PostMixin(LoginRequiredMixin):
+class CommentMixin(AuthorOnlyMixin):
+    model = Comment
+    template_name = 'blog/comment.html'
+    pk_url_kwarg = 'comment_id'
+
+    def get_success_url(self):
+        return reverse_lazy('blog:post_detail',
+                            kwargs={'post_id': self.kwargs['post_id']})
+
+
+class PostMixin(AuthorOnlyMixin):
     model = Post
     template_name = 'blog/create.html'
     pk_url_kwarg = 'post_id'
 
-    def dispatch(self, request, *args, **kwargs):
-        if self.get_object().author != request.user:
-            return redirect('blog:post_detail', post_id=self.kwargs['post_id'])
-        return super().dispatch(request, *args, **kwargs)
-
     def get_success_url(self) -> str:
         return reverse('blog:profile', kwargs={'username': self.request.user})
+
+
+class CursorPaginationMixin:
+    """Нумерованные страницы для начала ленты и курсор для глубоких."""
+
+    paginator_class = CappedPaginator
+
+    def paginate_queryset(self, queryset, page_size):
+        after = self.request.GET.get('after')
+        before = self.request.GET.get('before')
+        if after or before:
+            page = cursor_page(queryset, page_size, after, before)
+            return None, page, page.object_list, page.has_other_pages()
+        paginator, page, _, is_paginated = super().paginate_queryset(
+            queryset, page_size)
+        page.object_list = list(page.object_list)
+        if not page.has_next() and paginator.is_capped:
+            page.next_cursor = encode_cursor(page.object_list[-1])
+        return paginator, page, page.object_list, is_paginated
+
+
+class CommentPageMixin:
+    """Комментарии публикации порциями по курсору, старые или новые первыми.
+
+    Страница публикации показывает первую порцию, следующие отдаются
+    HTML-фрагментом по ?after=.
+    """
+
+    comments_per_page = PAGINATE_COMMENTS
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        order = 'new' if self.request.GET.get('order') == 'new' else 'old'
+        context['comments'] = cursor_page(
+            self.object.comments.select_related('author'),
+            self.comments_per_page, after=self.request.GET.get('after'),
+            key='created_at', descending=order == 'new')
+        context['comments_order'] = order
+        return context
+
+
+class AnonymousPageCacheMixin:
+    """Отдаёт анонимным пользователям готовую страницу из кэша."""
+
+    def get_cache_scopes(self):
+        return (FEED,)
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or request.user.is_authenticated:
+            return super().dispatch(request, *args, **kwargs)
+        key = page_cache_key(request, self.get_cache_scopes())
+        response = cache.get(key)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            if response.status_code == 200 and not response.cookies:
+                response.render()
+                cache.set(key, response, PAGE_CACHE_TIMEOUT)
+        return response
+
+    def get_cached_response(self):
+        return cache.get(
+            page_cache_key(self.request, self.get_cache_scopes()))
+
+
+class AsyncPageCacheMixin(AnonymousPageCacheMixin):
+    """Асинхронное представление для ASGI при включённом ASYNC_READ_VIEWS.
+
+    Кэш и база данных блокирующие, поэтому и поиск страницы в кэше, и
+    синхронное представление выполняются через sync_to_async в общем потоке
+    Django: соединение с базой данных остаётся одно на все запросы.
+    Пользователь без куки сессии заведомо анонимный, ему страница из кэша
+    отдаётся без загрузки сессии.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        sync_view = super().as_view(**initkwargs)
+        if not settings.ASYNC_READ_VIEWS:
+            return sync_view
+        render = sync_to_async(sync_view, thread_sensitive=True)
+
+        async def view(request, *args, **kwargs):
+            if (request.method == 'GET'
+                    and settings.SESSION_COOKIE_NAME not in request.COOKIES):
+                self = cls(**initkwargs)
+                self.setup(request, *args, **kwargs)
+                response = await sync_to_async(
+                    self.get_cached_response, thread_sensitive=True)()
+                if response is not None:
+                    return response
+            return await render(request, *args, **kwargs)
+
+        return update_wrapper(view, sync_view)
@@ -1,8 +1,30 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.dispatch import Signal
+
+from .storage import post_image_storage
 
 User = get_user_model()
 
+# Отправляется после массовых update() и bulk_create(), которые не вызывают
+# post_save: по нему сбрасываются закэшированные страницы.
+queryset_updated = Signal()
+
+
+class SignalQuerySet(models.QuerySet):
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        queryset_updated.send(sender=self.model, fields=tuple(kwargs))
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        queryset_updated.send(
+            sender=self.model,
+            fields=tuple(field.name for field in self.model._meta.fields))
+        return objs
+
 
 class BaseModel(models.Model):
     is_published = models.BooleanField(
@@ -12,6 +34,8 @@ class BaseModel(models.Model):
     created_at = models.DateTimeField('Добавлено',
                                       auto_now_add=True)
 
+    objects = SignalQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
@@ -62,12 +86,34 @@ class Post(BaseModel):
         Category, on_delete=models.SET_NULL, null=True,
         verbose_name='Категория'
     )
-    image = models.ImageField('Фото', upload_to='article_images', blank=True)
+    image = models.ImageField('Фото', upload_to='article_images', blank=True,
+                              storage=post_image_storage, db_index=True)
+    image_renditions = models.CharField(
+        'Ширины уменьшенных копий фото', max_length=64, blank=True,
+        editable=False
+    )
+    image_ready = models.BooleanField(
+        'Фото обработано', default=True, editable=False
+    )
+    comment_count = models.PositiveIntegerField(
+        'Количество комментариев', default=0, editable=False
+    )
 
     class Meta:
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
         ordering = ('-pub_date',)
+        indexes = (
+            models.Index(fields=('-pub_date', '-id'),
+                         condition=models.Q(is_published=True),
+                         name='post_published_feed_idx'),
+            models.Index(fields=('category', '-pub_date', '-id'),
+                         name='post_category_feed_idx'),
+            models.Index(fields=('author', '-pub_date', '-id'),
+                         name='post_author_feed_idx'),
+            models.Index(fields=('created_at', 'id'),
+                         name='post_created_idx'),
+        )
 
     def __str__(self):
         return self.title
@@ -82,3 +128,80 @@ class Comment(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
     author = models.ForeignKey(User, on_delete=models.CASCADE)
+
+    objects = SignalQuerySet.as_manager()
+
+    class Meta:
+        indexes = (
+            models.Index(fields=('post', 'created_at'),
+                         name='comment_post_created_idx'),
+            models.Index(fields=('created_at', 'id'),
+                         name='comment_created_idx'),
+        )
+
+
+class ImageTask(models.Model):
+    PENDING = 'pending'
+    PROCESSING = 'processing'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUSES = (
+        (PENDING, 'В очереди'),
+        (PROCESSING, 'Обрабатывается'),
+        (DONE, 'Готово'),
+        (FAILED, 'Ошибка'),
+    )
+
+    post = models.OneToOneField(
+        Post, on_delete=models.CASCADE, related_name='image_task',
+        verbose_name='Публикация'
+    )
+    image_name = models.CharField('Файл', max_length=256)
+    status = models.CharField('Статус', max_length=16, choices=STATUSES,
+                              default=PENDING)
+    attempts = models.PositiveSmallIntegerField('Попыток', default=0)
+    last_error = models.TextField('Последняя ошибка', blank=True)
+    run_after = models.DateTimeField('Выполнить после')
+    updated_at = models.DateTimeField('Изменено', auto_now=True)
+
+    class Meta:
+        verbose_name = 'обработка фото'
+        verbose_name_plural = 'Обработка фото'
+        indexes = (
+            models.Index(fields=('status', 'run_after'),
+                         name='imagetask_queue_idx'),
+        )
+
+    def __str__(self):
+        return f'{self.image_name} ({self.get_status_display()})'
+
+
+class SitemapShard(models.Model):
+    POSTS = 'posts'
+    PROFILES = 'profiles'
+    CATEGORIES = 'categories'
+    SECTIONS = (
+        (POSTS, 'Публикации'),
+        (PROFILES, 'Профили'),
+        (CATEGORIES, 'Категории'),
+    )
+
+    section = models.CharField('Раздел', max_length=16, choices=SECTIONS)
+    number = models.PositiveIntegerField('Номер')
+    changed_at = models.DateTimeField('Изменено', null=True)
+    generated_at = models.DateTimeField('Построено', null=True)
+
+    class Meta:
+        verbose_name = 'часть карты сайта'
+        verbose_name_plural = 'Карта сайта'
+        constraints = (
+            models.UniqueConstraint(fields=('section', 'number'),
+                                    name='sitemapshard_unique'),
+        )
+
+    def __str__(self):
+        return self.filename
+
+    @property
+    def filename(self):
+        return f'sitemap-{self.section}-{self.number}.xml'
@@ -0,0 +1,190 @@
+from datetime import datetime, timedelta, timezone
+
+from django.core.paginator import EmptyPage, PageNotAnInteger, Paginator
+from django.db.models import Max, Q
+from django.http import Http404
+from django.utils.functional import cached_property
+
+from .config import (
+    ADMIN_COUNT_LIMIT, PAGINATE_MAX_PAGE, PAGINATE_ON_EACH_SIDE,
+    PAGINATE_ON_ENDS
+)
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+MICROSECOND = timedelta(microseconds=1)
+# Первичный ключ в курсоре должен помещаться в INTEGER базы данных.
+MIN_PK, MAX_PK = -2 ** 63, 2 ** 63 - 1
+
+
+def encode_cursor(obj, key='pub_date'):
+    return f'{(getattr(obj, key) - EPOCH) // MICROSECOND}_{obj.pk}'
+
+
+def decode_cursor(cursor):
+    try:
+        microseconds, pk = (int(part) for part in cursor.split('_'))
+        if not MIN_PK <= pk <= MAX_PK:
+            raise ValueError
+        return EPOCH + microseconds * MICROSECOND, pk
+    except (ValueError, OverflowError):
+        raise Http404('Некорректный курсор страницы.')
+
+
+class CappedPaginator(Paginator):
+    """Нумерованный пагинатор, который не отдаёт страницы глубже предела."""
+
+    max_pages = PAGINATE_MAX_PAGE
+
+    @cached_property
+    def total_pages(self):
+        return Paginator.num_pages.func(self)
+
+    @cached_property
+    def num_pages(self):
+        return min(self.total_pages, self.max_pages)
+
+    @property
+    def is_capped(self):
+        return self.total_pages > self.num_pages
+
+
+class EstimatedCountPaginator(Paginator):
+    """Пагинатор админки: точно считает до предела, дальше — оценка.
+
+    Для таблицы без фильтров оценкой служит наибольший первичный ключ,
+    который SQLite берёт из индекса без обхода таблицы. За пределом номер
+    страницы не сверяется с оценкой: открывается любая непустая страница,
+    а в пагинаторе показываются соседние с текущей, которые точно не пусты.
+    """
+
+    count_limit = ADMIN_COUNT_LIMIT
+    # Сколько следующих страниц проверять и показывать за пределом.
+    pages_ahead = 3
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list.order_by()
+        count = queryset[:self.count_limit + 1].count()
+        if count <= self.count_limit or queryset.query.has_filters():
+            return count
+        return max(count, queryset.aggregate(Max('pk'))['pk__max'])
+
+    @property
+    def is_estimated(self):
+        return self.count > self.count_limit
+
+    def validate_number(self, number):
+        if not self.is_estimated:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger('Номер страницы должен быть числом.')
+        if number < 1:
+            raise EmptyPage('Номер страницы меньше 1.')
+        return number
+
+    def page(self, number):
+        if not self.is_estimated:
+            return super().page(number)
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        object_list = self.object_list[bottom:top]
+        if not object_list and number > 1:
+            raise EmptyPage('На странице нет результатов.')
+        ahead = self.object_list.order_by()[
+            top:top + self.per_page * self.pages_ahead].values('pk').count()
+        self.next_pages = -(-ahead // self.per_page)
+        return self._get_page(object_list, number, self)
+
+    def get_elided_page_range(self, number=1, *, on_each_side=3, on_ends=2):
+        if not self.is_estimated:
+            yield from super().get_elided_page_range(
+                number, on_each_side=on_each_side, on_ends=on_ends)
+            return
+        number = self.validate_number(number)
+        first = max(1, number - on_each_side)
+        last = number + getattr(self, 'next_pages', 0)
+        if first > on_ends + 1:
+            yield from range(1, on_ends + 1)
+            yield self.ELLIPSIS
+            yield from range(first, last + 1)
+        else:
+            yield from range(1, last + 1)
+
+
+def page_window(page):
+    return page.paginator.get_elided_page_range(
+        page.number, on_each_side=PAGINATE_ON_EACH_SIDE,
+        on_ends=PAGINATE_ON_ENDS)
+
+
+class CursorPage:
+    """Страница, выбранная по ключу (дата, id) без OFFSET."""
+
+    is_cursor = True
+
+    def __init__(self, object_list, has_next, has_previous, key='pub_date'):
+        self.object_list = object_list
+        self._has_next = has_next
+        self._has_previous = has_previous
+        self.key = key
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self):
+        return self._has_next
+
+    def has_previous(self):
+        return self._has_previous
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+    @property
+    def next_cursor(self):
+        if self.has_next():
+            return encode_cursor(self.object_list[-1], self.key)
+
+    @property
+    def previous_cursor(self):
+        if self.has_previous():
+            return encode_cursor(self.object_list[0], self.key)
+
+
+def cursor_page(queryset, page_size, after=None, before=None,
+                key='pub_date', descending=True):
+    """Страница после курсора after, перед курсором before или первая.
+
+    По умолчанию лента идёт от новых записей к старым по pub_date.
+    """
+    # Направление выборки: к большим значениям ключа или к меньшим.
+    ascending = bool(before) == descending
+    if ascending:
+        ordering, lookup = (key, 'pk'), 'gt'
+    else:
+        ordering, lookup = (f'-{key}', '-pk'), 'lt'
+    if after or before:
+        value, pk = decode_cursor(after or before)
+        # Нестрогая граница по ключу даёт SQLite диапазон индекса, а OR
+        # лишь отбрасывает записи с той же датой до курсора.
+        queryset = queryset.filter(**{f'{key}__{lookup}e': value}).filter(
+            Q(**{f'{key}__{lookup}': value})
+            | Q(**{key: value, f'pk__{lookup}': pk}))
+    object_list = list(queryset.order_by(*ordering)[:page_size + 1])
+    has_more = len(object_list) > page_size
+    object_list = object_list[:page_size]
+    if before:
+        object_list.reverse()
+        return CursorPage(object_list, has_next=bool(object_list),
+                          has_previous=has_more, key=key)
+    return CursorPage(object_list, has_next=has_more,
+                      has_previous=bool(after and object_list), key=key)
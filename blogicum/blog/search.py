@@ -0,0 +1,84 @@
+import re
+from functools import lru_cache
+
+import snowballstemmer
+from django.db import connection
+
+from .models import Post
+
+SEARCH_TABLE = 'blog_post_search'
+WORD = re.compile(r'\w+')
+
+_stemmer = snowballstemmer.stemmer('russian')
+
+
+@lru_cache(maxsize=65536)
+def stem(word):
+    return _stemmer.stemWord(word)
+
+
+def stem_text(text):
+    """Приводит слова текста к основам: «котами» и «коты» дают «кот»."""
+    words = WORD.findall(text.lower().replace('ё', 'е'))
+    return ' '.join(stem(word) for word in words)
+
+
+def match_expression(query):
+    """Строит запрос MATCH для FTS5: все основы слов должны найтись."""
+    stems = stem_text(query).split()
+    return ' '.join(f'"{word}"' for word in stems)
+
+
+def index_posts(posts):
+    rows = [(post.pk, stem_text(post.title), stem_text(post.text))
+            for post in posts]
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s',
+            [(row[0],) for row in rows])
+        cursor.executemany(
+            f'INSERT INTO {SEARCH_TABLE} (rowid, title, text) '
+            'VALUES (%s, %s, %s)', rows)
+
+
+def unindex_post(post_id):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {SEARCH_TABLE} WHERE rowid = %s', [post_id])
+
+
+def rebuild_index(queryset=None, chunk_size=2000):
+    """Переиндексирует публикации, по умолчанию все; возвращает их число."""
+    if queryset is None:
+        queryset = Post.objects.all()
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {SEARCH_TABLE}')
+    posts = queryset.only('title', 'text').iterator(chunk_size=chunk_size)
+    count, chunk = 0, []
+    for post in posts:
+        chunk.append(post)
+        if len(chunk) == chunk_size:
+            index_posts(chunk)
+            count, chunk = count + len(chunk), []
+    index_posts(chunk)
+    return count + len(chunk)
+
+
+def search(queryset, query):
+    """Оставляет публикации, подходящие под запрос, лучшие — первыми.
+
+    Совпадения в заголовке весят больше, чем в тексте.
+    """
+    match = match_expression(query)
+    if not match:
+        return queryset.none()
+    # Соединение с виртуальной таблицей FTS5 ORM выразить не умеет.
+    return queryset.extra(
+        tables=[SEARCH_TABLE],
+        where=[f'{SEARCH_TABLE}.rowid = {Post._meta.db_table}.id',
+               f'{SEARCH_TABLE} MATCH %s'],
+        params=[match],
+        select={'rank': f'bm25({SEARCH_TABLE}, 5.0, 1.0)'},
+    ).order_by('rank', '-pub_date', '-pk')
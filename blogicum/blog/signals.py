@@ -0,0 +1,161 @@
+from functools import partial
+from threading import local
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import (
+    post_delete, post_init, post_save, pre_delete
+)
+from django.dispatch import receiver
+
+from .cache import GLOBAL, bump_generations, bump_post_generations
+from .images import release_image
+from .models import (
+    Category, Comment, Location, Post, SitemapShard, queryset_updated
+)
+from .search import index_posts, unindex_post
+from .sitemaps import mark_all_changed, mark_changed
+from .tasks import enqueue_image
+from .utils import change_comment_count
+
+User = get_user_model()
+
+# Публикации, которые удаляются в текущем потоке: их комментарии удаляются
+# каскадом, и пересчитывать для них счётчики и поколения незачем.
+_deleting = local()
+
+# Служебные поля публикации, массовое обновление которых сопровождается
+# точечным сбросом поколений и не должно сбрасывать весь кэш.
+SERVICE_FIELDS = {'comment_count', 'image_renditions', 'image_ready'}
+
+
+@receiver(post_init, sender=Post)
+@receiver(post_init, sender=Comment)
+def remember_initial_relations(sender, instance, **kwargs):
+    fields = ('category_id', 'author_id', 'post_id')
+    instance._initial_relations = {
+        field: instance.__dict__.get(field) for field in fields
+    }
+    image = instance.__dict__.get('image')
+    instance._initial_relations['image'] = getattr(image, 'name', image)
+
+
+@receiver(pre_delete, sender=Post)
+def remember_deleting_post(sender, instance, **kwargs):
+    if not hasattr(_deleting, 'post_ids'):
+        _deleting.post_ids = set()
+    _deleting.post_ids.add(instance.pk)
+
+
+@receiver(post_save, sender=Post)
+def queue_post_image(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    initial = instance._initial_relations
+    if (instance.image.name or None) == (initial['image'] or None):
+        return
+    enqueue_image(instance)
+    if initial['image']:
+        transaction.on_commit(partial(release_image, initial['image']))
+    initial['image'] = instance.image.name
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def mark_post_sitemaps(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    mark_changed(SitemapShard.POSTS, {instance.pk})
+    mark_changed(SitemapShard.PROFILES, {
+        instance.author_id, instance._initial_relations['author_id']})
+    mark_changed(SitemapShard.CATEGORIES)
+
+
+@receiver(post_save, sender=Post)
+@receiver(post_delete, sender=Post)
+def invalidate_post(sender, instance, **kwargs):
+    initial = instance._initial_relations
+    transaction.on_commit(partial(
+        bump_post_generations,
+        {instance.pk},
+        {instance.category_id, initial['category_id']},
+        {instance.author_id, initial['author_id']},
+    ))
+    initial.update(category_id=instance.category_id,
+                   author_id=instance.author_id)
+    if kwargs['signal'] is post_delete:
+        _deleting.post_ids.discard(instance.pk)
+        transaction.on_commit(partial(release_image, instance.image.name))
+
+
+@receiver(post_save, sender=Post)
+def index_post(sender, instance, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is None or {'title', 'text'} & set(update_fields):
+        index_posts([instance])
+
+
+@receiver(post_delete, sender=Post)
+def unindex_deleted_post(sender, instance, **kwargs):
+    unindex_post(instance.pk)
+
+
+@receiver(queryset_updated)
+def invalidate_updated_queryset(sender, fields, **kwargs):
+    if sender is Post and set(fields) <= SERVICE_FIELDS:
+        return
+    transaction.on_commit(partial(bump_generations, GLOBAL))
+    if sender in (Post, Category):
+        mark_all_changed()
+
+
+@receiver(post_save, sender=Comment)
+def count_saved_comment(sender, instance, created, raw=False, **kwargs):
+    # Загруженные фикстуры уже содержат пересчитанный comment_count.
+    if raw:
+        return
+    old_post_id = instance._initial_relations['post_id']
+    if created:
+        change_comment_count(instance.post_id, 1)
+    elif old_post_id != instance.post_id:
+        change_comment_count(old_post_id, -1)
+        change_comment_count(instance.post_id, 1)
+    instance._initial_relations['post_id'] = instance.post_id
+    transaction.on_commit(partial(
+        invalidate_comment_posts, {old_post_id, instance.post_id}))
+
+
+@receiver(post_delete, sender=Comment)
+def count_deleted_comment(sender, instance, **kwargs):
+    if instance.post_id in getattr(_deleting, 'post_ids', ()):
+        return
+    change_comment_count(instance.post_id, -1)
+    transaction.on_commit(partial(
+        invalidate_comment_posts, {instance.post_id}))
+
+
+def invalidate_comment_posts(post_ids):
+    posts = Post.objects.filter(pk__in=post_ids).values_list(
+        'pk', 'category_id', 'author_id')
+    if posts:
+        bump_post_generations(*(set(column) for column in zip(*posts)))
+
+
+@receiver(post_save, sender=Category)
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Category)
+@receiver(post_delete, sender=Location)
+@receiver(post_delete, sender=User)
+def invalidate_everything(sender, **kwargs):
+    transaction.on_commit(partial(bump_generations, GLOBAL))
+    if sender is not Location:
+        mark_all_changed()
+
+
+@receiver(post_save, sender=User)
+def invalidate_user(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields and set(update_fields) == {'last_login'}:
+        return
+    transaction.on_commit(partial(bump_generations, GLOBAL))
+    mark_changed(SitemapShard.PROFILES, {instance.pk})
@@ -0,0 +1,177 @@
+import os
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+from django.contrib.auth import get_user_model
+from django.db.models import F, Max, Q
+from django.urls import reverse
+from django.utils import timezone
+
+from . import config
+from .models import Category, Post, SitemapShard
+from .utils import select
+
+User = get_user_model()
+
+XMLNS = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+INDEX_NAME = 'sitemap.xml'
+
+
+def shard_number(pk):
+    return (pk - 1) // config.SITEMAP_SHARD_SIZE
+
+
+def shard_range(number):
+    return (number * config.SITEMAP_SHARD_SIZE + 1,
+            (number + 1) * config.SITEMAP_SHARD_SIZE)
+
+
+def mark_changed(section, pks=None):
+    """Помечает части раздела с указанными id как требующие перестройки.
+
+    Без id помечается первая часть: категории в неё и помещаются.
+    """
+    if pks is None:
+        numbers = {0}
+    else:
+        numbers = {shard_number(pk) for pk in pks if pk is not None}
+    if not numbers:
+        return
+    now = timezone.now()
+    SitemapShard.objects.bulk_create(
+        [SitemapShard(section=section, number=number, changed_at=now)
+         for number in numbers],
+        ignore_conflicts=True)
+    SitemapShard.objects.filter(
+        section=section, number__in=numbers).update(changed_at=now)
+
+
+def mark_all_changed():
+    SitemapShard.objects.update(changed_at=timezone.now())
+
+
+def visible_posts():
+    return select(Post).order_by()
+
+
+def shard_urls(section, number):
+    """Пары (адрес, дата изменения) для одной части карты сайта."""
+    if section == SitemapShard.CATEGORIES:
+        categories = Category.objects.filter(is_published=True).annotate(
+            lastmod=Max('post__pub_date', filter=Q(
+                post__is_published=True,
+                post__pub_date__lte=timezone.now()))).order_by('pk')
+        for category in categories.iterator():
+            yield (reverse('blog:category_posts', args=(category.slug,)),
+                   category.lastmod)
+        return
+    first, last = shard_range(number)
+    if section == SitemapShard.POSTS:
+        posts = visible_posts().filter(pk__range=(first, last)).order_by(
+            'pk').values_list('pk', 'pub_date')
+        for pk, pub_date in posts.iterator():
+            yield reverse('blog:post_detail', args=(pk,)), pub_date
+        return
+    authors = visible_posts().filter(author__pk__range=(first, last)).values(
+        'author__username').annotate(lastmod=Max('pub_date')).order_by(
+        'author')
+    for author in authors.iterator():
+        yield (reverse('blog:profile', args=(author['author__username'],)),
+               author['lastmod'])
+
+
+def write_atomic(path, lines):
+    temporary = path.with_suffix('.tmp')
+    with open(temporary, 'w', encoding='utf-8') as file:
+        file.writelines(lines)
+    os.replace(temporary, path)
+
+
+def url_lines(base_url, urls):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<urlset xmlns="{XMLNS}">\n'
+    for location, lastmod in urls:
+        yield f'<url><loc>{escape(base_url + location)}</loc>'
+        if lastmod:
+            yield f'<lastmod>{lastmod.date().isoformat()}</lastmod>'
+        yield '</url>\n'
+    yield '</urlset>\n'
+
+
+def index_lines(base_url, shards):
+    yield '<?xml version="1.0" encoding="UTF-8"?>\n'
+    yield f'<sitemapindex xmlns="{XMLNS}">\n'
+    for shard in shards:
+        yield (f'<sitemap><loc>{escape(base_url)}/{shard.filename}</loc>'
+               f'<lastmod>{shard.generated_at.isoformat()}</lastmod>'
+               '</sitemap>\n')
+    yield '</sitemapindex>\n'
+
+
+def stale_shards(full=False):
+    """Части, которые нужно перестроить.
+
+    Это новые и изменённые части, а также те, где с прошлой сборки
+    наступила дата отложенных публикаций.
+    """
+    numbers = {
+        SitemapShard.POSTS: _all_numbers(Post),
+        SitemapShard.PROFILES: _all_numbers(User),
+        SitemapShard.CATEGORIES: {0},
+    }
+    for section, section_numbers in numbers.items():
+        SitemapShard.objects.bulk_create(
+            [SitemapShard(section=section, number=number)
+             for number in section_numbers],
+            ignore_conflicts=True)
+    shards = SitemapShard.objects.all()
+    if full:
+        return list(shards)
+    stale = Q(generated_at__isnull=True) | Q(
+        changed_at__gte=F('generated_at'))
+    since = shards.aggregate(since=Max('generated_at'))['since']
+    if since:
+        went_live = visible_posts().filter(pub_date__gt=since).values_list(
+            'pk', 'author_id')
+        posts, authors = set(), set()
+        for pk, author_id in went_live.iterator():
+            posts.add(shard_number(pk))
+            authors.add(shard_number(author_id))
+        if posts:
+            stale |= (
+                Q(section=SitemapShard.POSTS, number__in=posts)
+                | Q(section=SitemapShard.PROFILES, number__in=authors)
+                | Q(section=SitemapShard.CATEGORIES))
+    return list(shards.filter(stale))
+
+
+def _all_numbers(model):
+    max_pk = model.objects.aggregate(max_pk=Max('pk'))['max_pk']
+    return set(range(shard_number(max_pk) + 1)) if max_pk else set()
+
+
+def build_sitemaps(root, base_url, full=False):
+    """Перестраивает устаревшие части карты сайта и её индекс.
+
+    Возвращает перестроенные части.
+    """
+    root = Path(root)
+    root.mkdir(parents=True, exist_ok=True)
+    base_url = base_url.rstrip('/')
+    started = timezone.now()
+    rebuilt = stale_shards(full)
+    for shard in rebuilt:
+        path = root / shard.filename
+        urls = list(shard_urls(shard.section, shard.number))
+        if urls:
+            write_atomic(path, url_lines(base_url, urls))
+        elif path.exists():
+            path.unlink()
+        SitemapShard.objects.filter(pk=shard.pk).update(generated_at=started)
+    published = [
+        shard for shard in SitemapShard.objects.filter(
+            generated_at__isnull=False).order_by('section', 'number')
+        if (root / shard.filename).exists()
+    ]
+    write_atomic(root / INDEX_NAME, index_lines(base_url, published))
+    return rebuilt
@@ -0,0 +1,51 @@
+import hashlib
+import posixpath
+
+from django.contrib.staticfiles.storage import (
+    ManifestStaticFilesStorage, StaticFilesStorage
+)
+from django.core.files.storage import FileSystemStorage
+from django.utils.deconstruct import deconstructible
+
+
+def content_hash(content):
+    digest = hashlib.sha256()
+    for chunk in content.chunks():
+        digest.update(chunk)
+    content.seek(0)
+    return digest.hexdigest()
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """Хранит файлы под именем из хэша содержимого, одинаковые — один раз."""
+
+    def hashed_name(self, name, digest):
+        directory, filename = posixpath.split(name)
+        extension = posixpath.splitext(filename)[1].lower()
+        return posixpath.join(directory, digest[:2], digest + extension)
+
+    def save_as(self, name, content):
+        self.delete(name)
+        return super().save(name, content)
+
+    def save(self, name, content, max_length=None):
+        name = self.hashed_name(name, content_hash(content))
+        if self.exists(name):
+            return name
+        return super().save(name, content, max_length=max_length)
+
+
+post_image_storage = ContentAddressedStorage()
+
+
+class HashedStaticFilesStorage(ManifestStaticFilesStorage):
+    """Статика с хэшем в имени; без собранного манифеста — обычные имена."""
+
+    manifest_strict = False
+
+    def url(self, name, force=False):
+        try:
+            return super().url(name, force)
+        except ValueError:
+            return StaticFilesStorage.url(self, name)
@@ -0,0 +1,97 @@
+import csv
+import gzip
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .models import Comment, Post
+
+READ_CHUNK_SIZE = 64 * 1024
+EXPORT_CHUNK_SIZE = 2000
+
+# Поля выгрузки; внешние ключи выгружаются первичными ключами, как в dumpdata.
+EXPORT_FIELDS = {
+    Post: ('title', 'text', 'pub_date', 'author', 'location', 'category',
+           'image', 'is_published', 'created_at', 'comment_count'),
+    Comment: ('text', 'post', 'author', 'created_at'),
+}
+EXPORT_FORMATS = ('jsonl', 'csv')
+
+
+def open_stream(path, mode='r'):
+    """Открывает текстовый файл, сжатый gzip — если имя кончается на .gz."""
+    if str(path).endswith('.gz'):
+        return gzip.open(path, mode + 't', encoding='utf-8', newline='')
+    return open(path, mode, encoding='utf-8', newline='')
+
+
+def skip_separators(buffer, position):
+    while position < len(buffer) and buffer[position] in ' \t\r\n,':
+        position += 1
+    return position
+
+
+def read_json_array(file):
+    """По одному отдаёт элементы JSON-массива, не читая файл целиком."""
+    decoder = json.JSONDecoder()
+    buffer = file.read(READ_CHUNK_SIZE).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Ожидался JSON-массив объектов.')
+    position = 1
+    while True:
+        chunk = file.read(READ_CHUNK_SIZE)
+        buffer = buffer[position:] + chunk
+        position = 0
+        while True:
+            position = skip_separators(buffer, position)
+            if buffer[position:position + 1] == ']':
+                return
+            try:
+                item, position = decoder.raw_decode(buffer, position)
+            except json.JSONDecodeError:
+                if not chunk:
+                    raise ValueError('Файл JSON оборван.')
+                break
+            yield item
+        if not chunk:
+            return
+
+
+def read_records(path):
+    """Читает записи выгрузки: JSON-массив как у dumpdata или JSONL."""
+    with open_stream(path) as file:
+        if '.jsonl' in str(path):
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+        else:
+            yield from read_json_array(file)
+
+
+class Echo:
+    """Файл для csv.writer, который возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """Отдаёт кортежи (pk, *EXPORT_FIELDS) без создания объектов моделей."""
+    fields = EXPORT_FIELDS[queryset.model]
+    return queryset.values_list('pk', *fields).iterator(chunk_size=chunk_size)
+
+
+def export_lines(model, rows, export_format):
+    """Превращает строки export_rows в строки JSONL или CSV."""
+    fields = EXPORT_FIELDS[model]
+    if export_format == 'csv':
+        writer = csv.writer(Echo())
+        yield writer.writerow(('id', *fields))
+        for row in rows:
+            yield writer.writerow(row)
+        return
+    label = model._meta.label_lower
+    for pk, *values in rows:
+        yield json.dumps(
+            {'model': label, 'pk': pk, 'fields': dict(zip(fields, values))},
+            ensure_ascii=False, cls=DjangoJSONEncoder) + '\n'
@@ -0,0 +1,114 @@
+from datetime import timedelta
+
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .cache import bump_post_generations
+from .config import (
+    IMAGE_TASK_MAX_ATTEMPTS, IMAGE_TASK_RETRY_DELAY, IMAGE_TASK_STALE_AFTER
+)
+from .images import make_renditions
+from .models import ImageTask, Post
+
+
+def enqueue_image(post):
+    if not post.image:
+        ImageTask.objects.filter(post=post).delete()
+        Post.objects.filter(pk=post.pk).update(
+            image_renditions='', image_ready=True)
+        post.image_renditions, post.image_ready = '', True
+        return None
+    renditions = Post.objects.filter(
+        image=post.image.name, image_ready=True
+    ).exclude(pk=post.pk).values_list('image_renditions', flat=True).first()
+    if renditions is not None:
+        ImageTask.objects.filter(post=post).delete()
+        Post.objects.filter(pk=post.pk).update(
+            image_renditions=renditions, image_ready=True)
+        post.image_renditions, post.image_ready = renditions, True
+        return None
+    Post.objects.filter(pk=post.pk).update(
+        image_renditions='', image_ready=False)
+    post.image_renditions, post.image_ready = '', False
+    task, _ = ImageTask.objects.update_or_create(post=post, defaults={
+        'image_name': post.image.name,
+        'status': ImageTask.PENDING,
+        'attempts': 0,
+        'last_error': '',
+        'run_after': timezone.now(),
+    })
+    return task
+
+
+def claim_task():
+    now = timezone.now()
+    ready = (
+        Q(status=ImageTask.PENDING, run_after__lte=now)
+        | Q(status=ImageTask.PROCESSING,
+            updated_at__lt=now - timedelta(seconds=IMAGE_TASK_STALE_AFTER))
+    )
+    while True:
+        task = ImageTask.objects.filter(ready).order_by('run_after').first()
+        if task is None:
+            return None
+        claimed = ImageTask.objects.filter(
+            pk=task.pk, status=task.status, updated_at=task.updated_at
+        ).update(status=ImageTask.PROCESSING, attempts=F('attempts') + 1,
+                 updated_at=now)
+        if claimed:
+            task.refresh_from_db()
+            return task
+
+
+def _same_image(task):
+    return ImageTask.objects.filter(pk=task.pk, image_name=task.image_name)
+
+
+def _update_post(post, **fields):
+    updated = Post.objects.filter(
+        pk=post.pk, image=post.image.name).update(**fields)
+    if updated:
+        bump_post_generations({post.pk}, {post.category_id},
+                              {post.author_id})
+    return updated
+
+
+def finish_task(task, post, renditions):
+    _same_image(task).update(
+        status=ImageTask.DONE, last_error='', updated_at=timezone.now())
+    return _update_post(post, image_renditions=renditions, image_ready=True)
+
+
+def fail_task(task, post, error):
+    now = timezone.now()
+    if task.attempts >= IMAGE_TASK_MAX_ATTEMPTS:
+        _same_image(task).update(
+            status=ImageTask.FAILED, last_error=error, updated_at=now)
+        return _update_post(post, image_ready=True)
+    _same_image(task).update(
+        status=ImageTask.PENDING, last_error=error, updated_at=now,
+        run_after=now + timedelta(
+            seconds=IMAGE_TASK_RETRY_DELAY * task.attempts))
+    return 0
+
+
+def run_task(task):
+    post = Post.objects.filter(pk=task.post_id).first()
+    if post is None or post.image.name != task.image_name:
+        return 0
+    try:
+        renditions = make_renditions(post.image)
+    except Exception as error:
+        return fail_task(task, post, f'{type(error).__name__}: {error}')
+    return finish_task(task, post, renditions)
+
+
+def run_pending(limit=None):
+    processed = 0
+    while limit is None or processed < limit:
+        task = claim_task()
+        if task is None:
+            break
+        run_task(task)
+        processed += 1
+    return processed
@@ -0,0 +1,16 @@
+from django import template
+
+from blog.cache import get_generations, post_scope
+from blog.config import PAGE_CACHE_TIMEOUT
+
+register = template.Library()
+
+
+@register.simple_tag
+def post_generation(post):
+    return get_generations(post_scope(post.id))
+
+
+@register.simple_tag
+def page_cache_timeout():
+    return PAGE_CACHE_TIMEOUT
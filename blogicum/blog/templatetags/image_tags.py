@@ -0,0 +1,16 @@
+from django import template
+
+from blog.images import image_src as get_image_src
+from blog.images import image_srcset as get_image_srcset
+
+register = template.Library()
+
+
+@register.simple_tag
+def image_srcset(post):
+    return get_image_srcset(post)
+
+
+@register.simple_tag
+def image_src(post):
+    return get_image_src(post)
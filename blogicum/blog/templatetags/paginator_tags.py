@@ -0,0 +1,10 @@
+from django import template
+
+from blog.paginators import page_window as get_page_window
+
+register = template.Library()
+
+
+@register.simple_tag
+def page_window(page_obj):
+    return get_page_window(page_obj)
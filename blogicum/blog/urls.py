@@ -1,6 +1,6 @@
 from django.urls import path
 
-from . import views
+from . import api, feeds, views
 
 app_name = 'blog'
 
@@ -20,10 +20,35 @@ urlpatterns = [
          views.PostDeleteView.as_view(), name='delete_post'),
     path('posts/<int:post_id>/',
          views.PostDetailView.as_view(), name='post_detail'),
+    path('posts/<int:post_id>/comments/',
+         views.CommentListView.as_view(), name='post_comments'),
     path('category/<slug:category>/', views.CategoryShowView.as_view(),
          name='category_posts'),
+    path('search/', views.SearchView.as_view(), name='search'),
     path('edit_profile/', views.ProfileUpadateView.as_view(),
          name='edit_profile'),
     path('profile/<slug:username>/', views.ProfileView.as_view(),
          name='profile'),
+    path('feed/rss/', feeds.cached_feed(feeds.PostFeed()), name='feed_rss'),
+    path('feed/atom/', feeds.cached_feed(feeds.AtomPostFeed()),
+         name='feed_atom'),
+    path('category/<slug:category>/rss/',
+         feeds.category_feed(feeds.CategoryFeed()),
+         name='category_feed_rss'),
+    path('category/<slug:category>/atom/',
+         feeds.category_feed(feeds.AtomCategoryFeed()),
+         name='category_feed_atom'),
+    path('profile/<slug:username>/rss/',
+         feeds.author_feed(feeds.AuthorFeed()), name='author_feed_rss'),
+    path('profile/<slug:username>/atom/',
+         feeds.author_feed(feeds.AtomAuthorFeed()), name='author_feed_atom'),
+    path('api/posts/', api.PostListApiView.as_view(), name='api_posts'),
+    path('api/posts/<int:post_id>/', api.PostApiView.as_view(),
+         name='api_post'),
+    path('api/posts/<int:post_id>/comments/',
+         api.CommentListApiView.as_view(), name='api_comments'),
+    path('api/categories/', api.CategoryListApiView.as_view(),
+         name='api_categories'),
+    path('api/profiles/<slug:username>/', api.ProfileApiView.as_view(),
+         name='api_profile'),
 ]
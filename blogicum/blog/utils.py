@@ -1,15 +1,57 @@
-from django.db.models import Count
+from datetime import datetime, timezone as dt_timezone
 
-from .config import DATETIME_NOW
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .config import PUBLICATION_TIME_STEP
+from .models import Comment, Post
+
+POST_CARD_FIELDS = (
+    'title', 'text', 'pub_date', 'image', 'image_renditions', 'image_ready',
+    'is_published', 'comment_count',
+    'author', 'author__username',
+    'category', 'category__title', 'category__slug', 'category__is_published',
+    'location', 'location__name', 'location__is_published',
+)
+
+
+def publication_bucket():
+    return int(timezone.now().timestamp()) // PUBLICATION_TIME_STEP
+
+
+def publication_now(bucket=None):
+    if bucket is None:
+        bucket = publication_bucket()
+    return datetime.fromtimestamp(bucket * PUBLICATION_TIME_STEP,
+                                  tz=dt_timezone.utc)
+
+
+def is_visible(post, now=None):
+    return (post.is_published
+            and post.category is not None and post.category.is_published
+            and post.pub_date <= (now or publication_now()))
 
 
 def select(model):
     return model.objects.select_related(
         'author', 'location', 'category').filter(
-            is_published=True, pub_date__lte=DATETIME_NOW,
+            is_published=True, pub_date__lte=publication_now(),
             category__is_published=True)
 
 
 def anotate(queryset):
-    return queryset.prefetch_related('comments').annotate(
-        comment_count=Count('comments')).order_by('-pub_date')
+    return queryset.only(*POST_CARD_FIELDS).order_by('-pub_date', '-pk')
+
+
+def change_comment_count(post_id, delta):
+    Post.objects.filter(pk=post_id).update(
+        comment_count=F('comment_count') + delta)
+
+
+def recount_comments(queryset=None):
+    if queryset is None:
+        queryset = Post.objects.all()
+    counts = Comment.objects.filter(post=OuterRef('pk')).order_by().values(
+        'post').annotate(total=Count('pk')).values('total')
+    return queryset.update(comment_count=Coalesce(Subquery(counts), 0))
@@ -9,43 +9,61 @@ from django.views.generic import (
 )
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth import get_user_model
+from django.db.models import Count
+from django.utils.functional import cached_property
+from django.utils.http import urlencode
 
 from blog.models import Post, Category
+from .cache import author_scope, category_scope, post_scope
 from .forms import CommentsForm, PostForm
-from .config import DATETIME_NOW, PAGINATE_POST
-from .mixins import CommentMixin, PostMixin
-from .utils import select, anotate
+from .config import PAGINATE_POST
+from .mixins import (
+    AnonymousPageCacheMixin, AsyncPageCacheMixin, CommentMixin,
+    CommentPageMixin, CursorPaginationMixin, PostMixin
+)
+from .paginators import CappedPaginator
+from .search import search
+from .utils import select, anotate, is_visible
 
 User = get_user_model()
 
 
-class PostDetailView(DetailView):
+class PostDetailView(AsyncPageCacheMixin, CommentPageMixin, DetailView):
     model = Post
     template_name = 'blog/detail.html'
     context_object_name = 'post'
     pk_url_kwarg = 'post_id'
 
+    def get_cache_scopes(self):
+        return (post_scope(self.kwargs['post_id']),)
+
+    def get_queryset(self):
+        return Post.objects.select_related('author', 'category', 'location')
+
+    def get_object(self, queryset=None):
+        post = super().get_object(queryset)
+        if post.author != self.request.user and not is_visible(post):
+            raise Http404()
+        return post
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         context['form'] = CommentsForm()
-        context['profile'] = select(Post).filter(pk=self.kwargs['post_id'])
-        context['comments'] = self.object.comments.select_related('author')
         return context
 
-    def dispatch(self, request, *args, **kwargs):
-        post = get_object_or_404(Post, pk=kwargs['post_id'])
-        if post.author != request.user and (
-            post.is_published is False
-            or post.category.is_published is False
-                or post.pub_date > DATETIME_NOW):
-            raise Http404()
-        return super().dispatch(self.request, *args, **kwargs)
+
+class CommentListView(PostDetailView):
+    template_name = 'includes/comment_list.html'
 
 
-class CategoryShowView(ListView):
+class CategoryShowView(AsyncPageCacheMixin, CursorPaginationMixin,
+                       ListView):
     template_name = 'blog/category.html'
     paginate_by = PAGINATE_POST
 
+    def get_cache_scopes(self):
+        return (category_scope(self.kwargs['category']),)
+
     def get_queryset(self):
         return anotate(select(Post).filter(
             category__slug=self.kwargs['category']))
@@ -57,7 +75,8 @@ class CategoryShowView(ListView):
         return context
 
 
-class IndexView(ListView):
+class IndexView(AsyncPageCacheMixin, CursorPaginationMixin,
+                ListView):
     template_name = 'blog/index.html'
     paginate_by = PAGINATE_POST
 
@@ -65,23 +84,53 @@ class IndexView(ListView):
         return anotate(select(Post))
 
 
-class ProfileView(ListView):
+class ProfileView(AsyncPageCacheMixin, CursorPaginationMixin,
+                  ListView):
     template_name = 'blog/profile.html'
     paginate_by = PAGINATE_POST
 
+    def get_cache_scopes(self):
+        return (author_scope(self.kwargs['username']),)
+
+    @cached_property
+    def profile(self):
+        return get_object_or_404(
+            User.objects.annotate(post_count=Count('post')),
+            username=self.kwargs['username'])
+
+    def get_paginator(self, *args, **kwargs):
+        paginator = super().get_paginator(*args, **kwargs)
+        paginator.count = self.profile.post_count
+        return paginator
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        context['profile'] = get_object_or_404(
-            User, username=self.kwargs['username'])
+        context['profile'] = self.profile
         return context
 
     def get_queryset(self):
-        user_detail = get_object_or_404(User.objects.all(),
-                                        username=self.kwargs['username'])
         return anotate(Post.objects.select_related(
             'author', 'location', 'category').filter(
-            author=user_detail.id).prefetch_related(
-            'comments'))
+            author=self.profile.id))
+
+
+class SearchView(AnonymousPageCacheMixin, ListView):
+    template_name = 'blog/search.html'
+    paginate_by = PAGINATE_POST
+    paginator_class = CappedPaginator
+
+    @cached_property
+    def query(self):
+        return self.request.GET.get('q', '').strip()
+
+    def get_queryset(self):
+        return search(anotate(select(Post)), self.query)
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context['query'] = self.query
+        context['page_query'] = urlencode({'q': self.query}) + '&'
+        return context
 
 
 class ProfileUpadateView(LoginRequiredMixin, UpdateView):
@@ -105,10 +154,7 @@ class PostDeleteView(PostMixin, DeleteView):
 
 
 class PostUpdateView(PostMixin, UpdateView):
-    fields = (
-        'is_published', 'title', 'text', 'pub_date',
-        'location', 'category', 'image'
-    )
+    form_class = PostForm
 
 
 class CreatePost(LoginRequiredMixin, CreateView):
@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 
@@ -72,6 +73,17 @@ DATABASES = {
 }
 
 
+# Кэш общий для всех процессов: поколения кэша сдвигают и веб-процессы,
+# и обработчик изображений, и команды управления.
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('BLOGICUM_CACHE_DIR', BASE_DIR / 'cache'),
+        'OPTIONS': {'MAX_ENTRIES': 10_000},
+    }
+}
+
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -101,6 +113,10 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+STATIC_ROOT = BASE_DIR / 'static_root'
+
+STATICFILES_STORAGE = 'blog.storage.HashedStaticFilesStorage'
+
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 STATICFILES_DIRS = [
@@ -115,4 +131,15 @@ CSRF_FAILURE_VIEW = 'pages.views.csrf_failure'
 
 MEDIA_ROOT = BASE_DIR / 'media'
 
+MEDIA_URL = '/media/'
+
+# Асинхронные главная, категория, публикация и профиль. Включать только под
+# ASGI: под WSGI каждый такой запрос запускает свой цикл событий
+# (см. manage.py benchmark_servers).
+ASYNC_READ_VIEWS = False
+
+SITE_URL = 'http://127.0.0.1:8000'
+
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+
 LOGIN_URL = 'login'
@@ -1,11 +1,12 @@
 from django.contrib import admin
 from django.contrib.auth.forms import UserCreationForm
 from django.views.generic.edit import CreateView
-from django.urls import path, include, reverse_lazy
+from django.urls import path, include, re_path, reverse_lazy
 from django.conf import settings
-from django.conf.urls.static import static
 from django.contrib.auth import get_user_model
 
+from pages.files import file_patterns, serve
+
 
 User = get_user_model()
 
@@ -22,8 +23,15 @@ urlpatterns = [
         ),
         name='registration',
     ),
+    re_path(
+        r'^(?P<path>sitemap(-[a-z]+-\d+)?\.xml)$',
+        serve,
+        {'document_root': settings.SITEMAP_ROOT},
+    ),
     path('', include('blog.urls', namespace='blog')),
-] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
+]
+urlpatterns += file_patterns(settings.MEDIA_URL, settings.MEDIA_ROOT)
+urlpatterns += file_patterns(settings.STATIC_URL, settings.STATIC_ROOT)
 
 if settings.DEBUG:
     import debug_toolbar
@@ -0,0 +1,137 @@
+import mimetypes
+import os
+import posixpath
+import re
+from pathlib import Path
+
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, Http404, HttpResponse
+from django.urls import re_path
+from django.utils._os import safe_join
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_http_date_safe, quote_etag
+from django.views.decorators.http import require_safe
+
+# Имя содержит хэш содержимого: sha256 у картинок постов и их версий,
+# 12 символов md5 у статики после collectstatic.
+HASHED_NAME = re.compile(r'(^|[./_])([0-9a-f]{64}|[0-9a-f]{12})[._]')
+IMMUTABLE_MAX_AGE = 60 * 60 * 24 * 365
+MUTABLE_MAX_AGE = 60 * 60
+RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+class FileSlice:
+    """Отдаёт из открытого файла не больше length байт."""
+
+    def __init__(self, file, length):
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file.close()
+
+
+def file_etag(stat):
+    return quote_etag(f'{stat.st_mtime_ns:x}-{stat.st_size:x}')
+
+
+def parse_range(header, size):
+    """Возвращает (начало, конец) из заголовка Range или None.
+
+    Поддерживается один диапазон; несколько диапазонов и некорректный
+    заголовок дают None — файл отдаётся целиком. Для диапазона за
+    пределами файла начало больше конца.
+    """
+    match = RANGE.match(header.replace(' ', ''))
+    if not match or match.groups() == ('', ''):
+        return None
+    first, last = match.groups()
+    if not first:
+        start, end = max(size - int(last), 0), size - 1
+    else:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+        if last and int(last) < start:
+            return None
+    return start, end
+
+
+def range_applies(request, etag, last_modified):
+    if_range = request.META.get('HTTP_IF_RANGE')
+    if not if_range:
+        return True
+    if if_range.startswith(('"', 'W/')):
+        return if_range == etag
+    return parse_http_date_safe(if_range) == last_modified
+
+
+def cache_control(path):
+    if HASHED_NAME.search(posixpath.basename(path)):
+        return f'public, max-age={IMMUTABLE_MAX_AGE}, immutable'
+    return f'public, max-age={MUTABLE_MAX_AGE}'
+
+
+@require_safe
+def serve(request, path, document_root):
+    """Отдаёт файл с поддержкой условных запросов и Range."""
+    try:
+        full_path = Path(safe_join(document_root, path))
+    except SuspiciousFileOperation:
+        raise Http404
+    if not full_path.is_file():
+        raise Http404
+    stat = full_path.stat()
+    etag = file_etag(stat)
+    last_modified = int(stat.st_mtime)
+    response = get_conditional_response(
+        request, etag=etag, last_modified=last_modified
+    )
+    if response is None:
+        content_type, encoding = mimetypes.guess_type(str(full_path))
+        content_type = content_type or 'application/octet-stream'
+        size = stat.st_size
+        header = request.META.get('HTTP_RANGE')
+        byte_range = None
+        if header and range_applies(request, etag, last_modified):
+            byte_range = parse_range(header, size)
+            if byte_range and byte_range[0] > byte_range[1]:
+                response = HttpResponse(status=416)
+                response['Content-Range'] = f'bytes */{size}'
+                return response
+        file = full_path.open('rb')
+        if byte_range is None:
+            response = FileResponse(file, content_type=content_type)
+        else:
+            start, end = byte_range
+            file.seek(start)
+            response = FileResponse(
+                FileSlice(file, end - start + 1),
+                status=206,
+                content_type=content_type,
+            )
+            response['Content-Length'] = end - start + 1
+            response['Content-Range'] = f'bytes {start}-{end}/{size}'
+        if encoding:
+            response['Content-Encoding'] = encoding
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified)
+    response['Cache-Control'] = cache_control(path)
+    response['Accept-Ranges'] = 'bytes'
+    return response
+
+
+def file_patterns(prefix, document_root):
+    return [
+        re_path(
+            r'^{}(?P<path>.+)$'.format(re.escape(prefix.lstrip('/'))),
+            serve,
+            {'document_root': os.fspath(document_root)},
+        ),
+    ]
@@ -1,5 +1,7 @@
 import os
 import re
+import shutil
+import tempfile
 import time
 from http import HTTPStatus
 from inspect import getsource
@@ -18,7 +20,10 @@ from typing import (
 
 import pytest
 from django.apps import apps
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
 from django.db.models import Model, Field
 from django.forms import BaseForm
 from django.http import HttpResponse
@@ -41,6 +46,37 @@ def enable_debug_false():
         yield
 
 
+def pytest_configure(config):
+    # Кэш тестов хранится во временном каталоге, а не в каталоге проекта.
+    # Настройка меняется до сбора тестов: при сборе pytest обращается к
+    # импортированному в модули кэшу и тем самым создаёт его каталог.
+    # Дочерние процессы получают каталог через переменную окружения.
+    location = tempfile.mkdtemp(prefix="blogicum-cache-")
+    config.cache_settings = override_settings(CACHES={
+        "default": {**settings.CACHES["default"], "LOCATION": location}})
+    config.cache_settings.enable()
+    os.environ["BLOGICUM_CACHE_DIR"] = location
+
+
+def pytest_unconfigure(config):
+    config.cache_settings.disable()
+    shutil.rmtree(os.environ.pop("BLOGICUM_CACHE_DIR"), ignore_errors=True)
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def run_on_commit_immediately(monkeypatch):
+    # Транзакция теста не фиксируется, поэтому действия после фиксации
+    # выполняются сразу, как в коде вне транзакции.
+    monkeypatch.setattr(
+        transaction, "on_commit", lambda func, using=None: func())
+
+
 class SafeImportFromContextManager:
     def __init__(
             self,
@@ -0,0 +1,126 @@
+from datetime import timedelta
+
+import pytest
+from django.core.paginator import EmptyPage
+from django.utils import timezone
+
+from blog.admin import PostAdmin
+from blog.models import Comment, Post
+from blog.paginators import EstimatedCountPaginator
+
+
+@pytest.fixture
+def posts(mixer, user, another_user, published_category):
+    location = mixer.blend("blog.Location")
+    now = timezone.now() - timedelta(days=1)
+    return [
+        mixer.blend(
+            "blog.Post", title=title, text="Текст", author=author,
+            category=published_category, location=location,
+            pub_date=now,
+        )
+        for title, author in (
+            ("Котики", user), ("Собаки", another_user), ("Котята", user)
+        )
+    ]
+
+
+@pytest.mark.django_db
+def test_post_changelist_search_and_filters(
+        admin_client, posts, user, another_user):
+    response = admin_client.get("/admin/blog/post/", {"q": "котики"})
+    assert response.status_code == 200
+    assert list(response.context["cl"].result_list) == [posts[0]], (
+        "Убедитесь, что поиск в админке публикаций использует"
+        " полнотекстовый индекс."
+    )
+    response = admin_client.get(
+        "/admin/blog/post/", {"author__id__exact": user.id})
+    assert set(response.context["cl"].result_list) == {posts[0], posts[2]}
+    content = response.content.decode()
+    assert "admin-autocomplete" in content and (
+        another_user.username not in content), (
+        "Убедитесь, что фильтр по автору не выводит список всех"
+        " пользователей."
+    )
+
+
+@pytest.mark.django_db
+def test_post_changelist_query_count(
+        admin_client, posts, django_assert_max_num_queries):
+    with django_assert_max_num_queries(8):
+        response = admin_client.get("/admin/blog/post/")
+    assert response.context["cl"].result_count == 3
+
+
+@pytest.mark.django_db
+def test_comment_changelist_search(admin_client, mixer, posts, user):
+    first = mixer.blend("blog.Comment", post=posts[0], author=user)
+    mixer.blend("blog.Comment", post=posts[1], author=user)
+    response = admin_client.get(
+        "/admin/blog/comment/", {"q": str(posts[0].id)})
+    assert list(response.context["cl"].result_list) == [first]
+    response = admin_client.get(
+        "/admin/blog/comment/", {"q": user.username[:3]})
+    assert response.context["cl"].result_count == 2, (
+        "Убедитесь, что комментарии ищутся по началу логина автора."
+    )
+
+
+@pytest.mark.django_db
+def test_user_autocomplete(admin_client, user):
+    response = admin_client.get("/admin/autocomplete/", {
+        "term": user.username[:3], "app_label": "blog",
+        "model_name": "post", "field_name": "author",
+    })
+    assert response.status_code == 200
+    assert str(user.id) in [
+        item["id"] for item in response.json()["results"]
+    ]
+
+
+@pytest.mark.django_db
+def test_estimated_count_paginator(posts, monkeypatch):
+    monkeypatch.setattr(EstimatedCountPaginator, "count_limit", 2)
+    paginator = EstimatedCountPaginator(Post.objects.all(), 10)
+    assert paginator.count == max(post.id for post in posts), (
+        "Убедитесь, что для больших таблиц количество записей оценивается."
+    )
+    filtered = EstimatedCountPaginator(
+        Post.objects.filter(title__startswith="Кот"), 10)
+    assert filtered.count == 2
+    assert EstimatedCountPaginator(Comment.objects.all(), 10).count == 0
+
+
+@pytest.mark.django_db
+def test_estimated_pages_stay_reachable(
+        admin_client, mixer, posts, monkeypatch):
+    monkeypatch.setattr(EstimatedCountPaginator, "count_limit", 2)
+    Post.objects.filter(pk=posts[1].pk).delete()
+    mixer.cycle(4).blend("blog.Post", title="Кот", author=posts[0].author,
+                         category=posts[0].category)
+    filtered = EstimatedCountPaginator(
+        Post.objects.filter(title__startswith="Кот").order_by("pk"), 1)
+    assert filtered.count == 3
+    last = filtered.page(6)
+    assert list(last) == list(
+        Post.objects.filter(title__startswith="Кот").order_by("pk"))[5:], (
+        "Убедитесь, что страницы за пределом точного подсчёта доступны."
+    )
+    assert list(filtered.get_elided_page_range(6)) == [
+        1, 2, 3, 4, 5, 6
+    ], "Убедитесь, что пагинатор не ссылается на пустые страницы."
+    page = filtered.page(2)
+    assert list(filtered.get_elided_page_range(2)) == [1, 2, 3, 4, 5]
+    assert page.number == 2
+    with pytest.raises(EmptyPage):
+        filtered.page(7)
+
+    monkeypatch.setattr(PostAdmin, "list_per_page", 1)
+    response = admin_client.get(
+        "/admin/blog/post/", {"title__startswith": "Кот", "p": 6})
+    assert response.status_code == 200, (
+        "Убедитесь, что админка открывает страницы отфильтрованного списка"
+        " за пределом точного подсчёта."
+    )
+    assert len(response.context["cl"].result_list) == 1
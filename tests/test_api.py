@@ -0,0 +1,131 @@
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.test import Client
+from django.utils import timezone
+from django.utils.http import http_date
+
+from blog.utils import publication_bucket
+
+
+@pytest.fixture
+def feed(mixer, user, published_category):
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post", title=f"Пост {number}", author=user,
+            category=published_category, is_published=True,
+            pub_date=now - timedelta(hours=number + 1),
+        )
+        for number in range(5)
+    ]
+
+
+@pytest.mark.django_db
+def test_post_list_cursor_pagination(unlogged_client: Client, feed):
+    response = unlogged_client.get(
+        "/api/posts/", {"limit": 2, "fields": "id,title"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["results"] == [
+        {"id": post.id, "title": post.title} for post in feed[:2]
+    ], "Убедитесь, что API отдаёт только запрошенные поля."
+    assert data["previous"] is None
+    seen = [item["id"] for item in data["results"]]
+    while data["next"]:
+        data = unlogged_client.get(data["next"]).json()
+        seen += [item["id"] for item in data["results"]]
+    assert seen == [post.id for post in feed], (
+        "Убедитесь, что по ссылкам next можно пролистать всю ленту."
+    )
+    data = unlogged_client.get(data["previous"]).json()
+    assert [item["id"] for item in data["results"]] == [
+        post.id for post in feed[2:4]
+    ]
+
+
+@pytest.mark.django_db
+def test_post_list_hides_invisible_posts(
+        unlogged_client: Client, feed, mixer, user, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() + timedelta(days=1),
+    )
+    data = unlogged_client.get("/api/posts/", {"limit": 100}).json()
+    assert len(data["results"]) == len(feed), (
+        "Убедитесь, что API показывает только опубликованные публикации."
+    )
+    assert data["results"][0]["author"] == user.username
+
+
+@pytest.mark.django_db
+def test_conditional_get(unlogged_client: Client, feed):
+    response = unlogged_client.get("/api/posts/")
+    etag, last_modified = response["ETag"], response["Last-Modified"]
+    assert unlogged_client.get(
+        "/api/posts/", HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+        "Убедитесь, что при неизменной ленте API отвечает 304."
+    )
+    assert unlogged_client.get(
+        "/api/posts/", HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == 304
+    feed[3].title = "Исправленный заголовок"
+    feed[3].save()
+    assert unlogged_client.get(
+        "/api/posts/", HTTP_IF_NONE_MATCH=etag).status_code == 200, (
+        "Убедитесь, что после изменения публикации ETag ленты меняется."
+    )
+
+
+@pytest.mark.django_db
+def test_post_and_comments(unlogged_client: Client, feed, mixer, user):
+    post = feed[0]
+    comments = mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+    data = unlogged_client.get(f"/api/posts/{post.id}/").json()
+    assert data["comment_count"] == 3
+    first = unlogged_client.get(data["comments"], {"limit": 2}).json()
+    rest = unlogged_client.get(first["next"]).json()
+    assert [item["id"] for item in first["results"] + rest["results"]] == [
+        comment.id for comment in comments
+    ]
+    response = unlogged_client.get(f"/api/posts/{post.id}/")
+    assert response["Last-Modified"] == http_date(
+        comments[-1].created_at.timestamp()), (
+        "Убедитесь, что Last-Modified учитывает новые комментарии."
+    )
+    assert unlogged_client.get("/api/posts/0/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_categories_and_profile(
+        unlogged_client: Client, feed, user, published_category):
+    data = unlogged_client.get("/api/categories/").json()
+    assert [item["slug"] for item in data["results"]] == [
+        published_category.slug
+    ]
+    data = unlogged_client.get(f"/api/profiles/{user.username}/").json()
+    assert data["post_count"] == len(feed)
+    posts = unlogged_client.get(data["posts"], {"limit": 100}).json()
+    assert len(posts["results"]) == len(feed)
+
+
+@pytest.mark.django_db
+def test_unknown_fields(unlogged_client: Client, feed):
+    response = unlogged_client.get("/api/posts/", {"fields": "id,password"})
+    assert response.status_code == 400
+    assert "password" in response.json()["error"]
+
+
+@pytest.mark.django_db
+def test_etag_survives_time_step_and_cache_loss(
+        unlogged_client: Client, feed, monkeypatch):
+    etag = unlogged_client.get("/api/posts/")["ETag"]
+    bucket = publication_bucket()
+    monkeypatch.setattr("blog.cache.publication_bucket", lambda: bucket + 1)
+    cache.clear()
+    assert unlogged_client.get(
+        "/api/posts/", HTTP_IF_NONE_MATCH=etag).status_code == 304, (
+        "Убедитесь, что ETag ленты зависит от её содержимого, а не от шага"
+        " публикации или поколений кэша процесса."
+    )
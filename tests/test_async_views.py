@@ -0,0 +1,77 @@
+import asyncio
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.http import Http404
+from django.test import RequestFactory
+from django.urls import resolve
+
+from blog.views import (
+    CategoryShowView, IndexView, PostDetailView, ProfileView
+)
+
+
+@pytest.fixture
+def async_read_views(settings):
+    # Адреса загружаются до включения настройки, чтобы остальные тесты
+    # получили синхронные представления.
+    resolve("/")
+    settings.ASYNC_READ_VIEWS = True
+
+
+def anonymous_get(path):
+    request = RequestFactory().get(path)
+    request.user = AnonymousUser()
+    return request
+
+
+def test_sync_views_by_default():
+    assert not asyncio.iscoroutinefunction(resolve("/").func), (
+        "Убедитесь, что по умолчанию ленты остаются синхронными."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("view_class", (
+    IndexView, CategoryShowView, PostDetailView, ProfileView))
+def test_async_view_matches_sync_and_uses_cache(
+        async_read_views, client, view_class, post_with_published_location,
+        django_assert_num_queries):
+    post = post_with_published_location
+    path, kwargs = {
+        IndexView: ("/", {}),
+        CategoryShowView: (
+            f"/category/{post.category.slug}/",
+            {"category": post.category.slug}),
+        PostDetailView: (f"/posts/{post.id}/", {"post_id": post.id}),
+        ProfileView: (
+            f"/profile/{post.author.username}/",
+            {"username": post.author.username}),
+    }[view_class]
+    view = view_class.as_view()
+    assert asyncio.iscoroutinefunction(view), (
+        "Убедитесь, что при включённой настройке `ASYNC_READ_VIEWS`"
+        " представление асинхронное."
+    )
+    response = async_to_sync(view)(anonymous_get(path), **kwargs)
+    assert response.status_code == 200
+    cache.clear()
+    assert client.get(path).content == response.content, (
+        "Убедитесь, что асинхронное представление выводит ту же страницу,"
+        " что и синхронное."
+    )
+    with django_assert_num_queries(0):
+        cached = async_to_sync(view)(anonymous_get(path), **kwargs)
+    assert cached.content == response.content, (
+        "Убедитесь, что асинхронное представление отдаёт страницу из кэша"
+        " без запросов к базе данных."
+    )
+
+
+@pytest.mark.django_db
+def test_async_view_raises_404(async_read_views):
+    view = PostDetailView.as_view()
+    with pytest.raises(Http404):
+        async_to_sync(view)(anonymous_get("/posts/1/"), post_id=1)
@@ -0,0 +1,154 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.utils import make_template_fragment_key
+from django.db import transaction
+from django.test import Client
+
+from blog.cache import get_generations, post_scope
+from blog.models import Post
+
+ON_COMMIT = transaction.on_commit
+
+
+@pytest.mark.django_db
+def test_anonymous_pages_served_from_cache(
+        unlogged_client: Client, post_with_published_location,
+        django_assert_num_queries
+):
+    post = post_with_published_location
+    urls = (
+        "/",
+        f"/category/{post.category.slug}/",
+        f"/posts/{post.id}/",
+    )
+    for url in urls:
+        first = unlogged_client.get(url)
+        with django_assert_num_queries(0):
+            second = unlogged_client.get(url)
+        assert second.content == first.content, (
+            f"Убедитесь, что страница `{url}` отдаётся анонимным"
+            " пользователям из кэша без обращений к базе данных."
+        )
+
+
+@pytest.mark.django_db
+def test_page_cache_invalidated_on_changes(
+        mixer, unlogged_client: Client, user_client: Client,
+        post_with_published_location
+):
+    post = post_with_published_location
+    unlogged_client.get("/")
+    user_client.post(f"/posts/{post.id}/comment/", data={"text": "Новый"})
+    assert "Комментарии (1)" in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что кэш главной страницы сбрасывается при добавлении"
+        " комментария."
+    )
+
+    post.title = "Заголовок после правки"
+    post.save()
+    content = unlogged_client.get(f"/posts/{post.id}/").content.decode()
+    assert post.title in content, (
+        "Убедитесь, что кэш страницы публикации сбрасывается при её"
+        " изменении."
+    )
+
+    post.category.is_published = False
+    post.category.save()
+    assert post.title not in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что кэш главной страницы сбрасывается при снятии"
+        " категории с публикации."
+    )
+
+
+@pytest.mark.django_db
+def test_post_card_fragment_cached_for_users(
+        user_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    user_client.get("/")
+    key = make_template_fragment_key(
+        "post_card", [post.id, get_generations(post_scope(post.id))])
+    assert post.title in (cache.get(key) or ""), (
+        "Убедитесь, что для авторизованных пользователей карточки публикаций"
+        " кэшируются как фрагменты шаблона."
+    )
+
+
+@pytest.mark.django_db
+def test_generations_scoped_to_changed_content(
+        mixer, unlogged_client: Client, post_with_published_location,
+        post_with_another_category, django_assert_num_queries
+):
+    post = post_with_published_location
+    other_url = f"/category/{post_with_another_category.category.slug}/"
+    unlogged_client.get(other_url)
+    post.title = "Заголовок после правки"
+    post.save()
+    with django_assert_num_queries(0):
+        unlogged_client.get(other_url)
+    content = unlogged_client.get(
+        f"/category/{post.category.slug}/").content.decode()
+    assert post.title in content, (
+        "Убедитесь, что изменение публикации сбрасывает кэш страницы её"
+        " категории."
+    )
+
+
+@pytest.mark.django_db
+def test_queryset_update_invalidates_pages(
+        unlogged_client: Client, post_with_published_location
+):
+    post = post_with_published_location
+    assert post.title in unlogged_client.get("/").content.decode()
+    Post.objects.filter(pk=post.pk).update(is_published=False)
+    assert post.title not in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что массовое изменение публикаций через `update()`"
+        " сбрасывает кэш страниц."
+    )
+
+
+@pytest.mark.django_db
+def test_generations_bumped_after_commit(
+        monkeypatch, unlogged_client: Client, post_with_published_location,
+        django_capture_on_commit_callbacks
+):
+    monkeypatch.setattr(transaction, "on_commit", ON_COMMIT)
+    post = post_with_published_location
+    url = f"/posts/{post.id}/"
+    unlogged_client.get(url)
+    with django_capture_on_commit_callbacks() as callbacks:
+        post.title = "Заголовок после фиксации"
+        post.save()
+        assert post.title not in unlogged_client.get(url).content.decode(), (
+            "Убедитесь, что поколения кэша сдвигаются только после фиксации"
+            " транзакции, иначе параллельный запрос закэширует старые"
+            " данные под новым поколением."
+        )
+    for callback in callbacks:
+        callback()
+    assert post.title in unlogged_client.get(url).content.decode()
+
+
+@pytest.mark.django_db
+def test_generations_shared_between_processes(post_with_published_location):
+    scope = post_scope(post_with_published_location.id)
+    before = get_generations(scope)
+    # Поколение сдвигает другой процесс, как обработчик изображений.
+    subprocess.run(
+        [sys.executable, "manage.py", "shell", "-c",
+         f"from blog.cache import bump_generations; "
+         f"bump_generations({scope!r})"],
+        cwd=Path(settings.BASE_DIR), check=True, env={
+            **os.environ,
+            "BLOGICUM_CACHE_DIR": str(settings.CACHES["default"]["LOCATION"]),
+        })
+    assert get_generations(scope) != before, (
+        "Убедитесь, что кэш по умолчанию общий для процессов: поколения,"
+        " сдвинутые в другом процессе, должны сбрасывать страницы."
+    )
@@ -0,0 +1,66 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db.models import Model
+from django.test import Client
+
+from blog.models import Comment, Post
+
+
+@pytest.mark.django_db(transaction=True)
+def test_comment_count_follows_views(
+        user_client: Client, user: Model, post_with_published_location: Post
+):
+    post = post_with_published_location
+    add_url = f"/posts/{post.id}/comment/"
+    for i in range(3):
+        user_client.post(add_url, data={"text": f"Комментарий {i}"})
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при добавлении комментария увеличивается счётчик"
+        " `comment_count` у публикации."
+    )
+
+    comment = Comment.objects.filter(post=post).first()
+    user_client.post(
+        f"/posts/{post.id}/delete_comment/{comment.id}", data={})
+    post.refresh_from_db()
+    assert post.comment_count == 2, (
+        "Убедитесь, что при удалении комментария уменьшается счётчик"
+        " `comment_count` у публикации."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_recount_comments_command(
+        mixer, post_with_published_location: Post
+):
+    post = post_with_published_location
+    mixer.cycle(4).blend("blog.Comment", post=post)
+    Post.objects.filter(pk=post.pk).update(comment_count=0)
+    call_command("recount_comments", stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 4, (
+        "Убедитесь, что команда `recount_comments` пересчитывает количество"
+        " комментариев у публикаций."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_loaddata_keeps_comment_count(
+        mixer, tmp_path, post_with_published_location: Post
+):
+    post = post_with_published_location
+    mixer.cycle(3).blend("blog.Comment", post=post)
+    fixture = tmp_path / "blog.json"
+    call_command(
+        "dumpdata", "blog.post", "blog.comment", output=str(fixture),
+        stdout=StringIO())
+    Post.objects.all().delete()
+    call_command("loaddata", str(fixture), stdout=StringIO())
+    post.refresh_from_db()
+    assert post.comment_count == 3, (
+        "Убедитесь, что при загрузке фикстур (`loaddata`) счётчик"
+        " `comment_count` не увеличивается повторно."
+    )
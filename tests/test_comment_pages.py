@@ -0,0 +1,73 @@
+import re
+from datetime import timedelta
+from html import unescape
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+COMMENT_ID = re.compile(r'name="comment_(\d+)"')
+FRAGMENT = re.compile(r'data-fragment="([^"]+)"')
+
+
+@pytest.fixture
+def commented_post(mixer, user, published_category, monkeypatch):
+    monkeypatch.setattr(
+        'blog.mixins.CommentPageMixin.comments_per_page', 2)
+    post = mixer.blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1),
+    )
+    comments = mixer.cycle(5).blend('blog.Comment', post=post, author=user)
+    return post, [comment.id for comment in comments]
+
+
+def read_thread(client, url):
+    content = client.get(url).content.decode()
+    ids = [int(pk) for pk in COMMENT_ID.findall(content)]
+    pages = 1
+    while FRAGMENT.search(content):
+        response = client.get(unescape(FRAGMENT.search(content)[1]))
+        assert response.status_code == 200
+        content = response.content.decode()
+        ids += [int(pk) for pk in COMMENT_ID.findall(content)]
+        pages += 1
+    return ids, pages
+
+
+@pytest.mark.django_db
+def test_detail_shows_first_comments(
+        unlogged_client: Client, commented_post):
+    post, comment_ids = commented_post
+    content = unlogged_client.get(f'/posts/{post.id}/').content.decode()
+    assert [int(pk) for pk in COMMENT_ID.findall(content)] == (
+        comment_ids[:2]), (
+        'Убедитесь, что страница публикации показывает только первую'
+        ' порцию комментариев.'
+    )
+    assert 'Показать ещё комментарии' in content
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize('order', ('old', 'new'))
+def test_load_more_reads_whole_thread(
+        unlogged_client: Client, commented_post, order):
+    post, comment_ids = commented_post
+    ids, pages = read_thread(
+        unlogged_client, f'/posts/{post.id}/?order={order}')
+    expected = comment_ids if order == 'old' else comment_ids[::-1]
+    assert ids == expected, (
+        'Убедитесь, что по кнопке «Показать ещё» подгружаются все'
+        ' комментарии по порядку.'
+    )
+    assert pages == 3
+
+
+@pytest.mark.django_db
+def test_fragment_hides_invisible_post(
+        unlogged_client: Client, commented_post):
+    post, _ = commented_post
+    post.is_published = False
+    post.save()
+    assert unlogged_client.get(
+        f'/posts/{post.id}/comments/').status_code == 404
@@ -0,0 +1,119 @@
+import csv
+import gzip
+import json
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from blog.models import Comment, Post
+
+
+@pytest.fixture
+def comments(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    return mixer.cycle(3).blend("blog.Comment", post=post, author=user)
+
+
+def export(*args, **options):
+    out = StringIO()
+    call_command("export_blog", *map(str, args), stdout=out, **options)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+def test_export_jsonl_roundtrip(tmp_path, comments):
+    path = tmp_path / "comments.jsonl.gz"
+    assert "3" in export("comments", path, chunk_size=2)
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        records = [json.loads(line) for line in file]
+    assert [record["pk"] for record in records] == [
+        comment.pk for comment in comments
+    ]
+    assert records[0]["model"] == "blog.comment"
+    assert records[0]["fields"]["post"] == comments[0].post_id
+
+    posts = tmp_path / "posts.jsonl"
+    export("posts", posts)
+    Comment.objects.all().delete()
+    Post.objects.all().delete()
+    call_command(
+        "import_blog", str(posts), str(path), stdout=StringIO())
+    assert Comment.objects.count() == 3, (
+        "Убедитесь, что выгрузку в JSONL можно загрузить командой"
+        " import_blog."
+    )
+
+
+@pytest.mark.django_db
+def test_export_csv(tmp_path, comments):
+    path = tmp_path / "comments.csv"
+    export("comments", path)
+    with open(path, encoding="utf-8", newline="") as file:
+        rows = list(csv.reader(file))
+    assert rows[0] == ["id", "text", "post", "author", "created_at"]
+    assert [row[1] for row in rows[1:]] == [
+        comment.text for comment in comments
+    ]
+
+
+@pytest.mark.django_db
+def test_incremental_export(tmp_path, comments, mixer):
+    state = tmp_path / "state.json"
+    first, second = tmp_path / "first.jsonl", tmp_path / "second.jsonl"
+    export("comments", first, state=state)
+    new = mixer.blend(
+        "blog.Comment", post=comments[0].post, author=comments[0].author)
+    export("comments", second, state=state)
+    assert len(first.read_text().splitlines()) == 3
+    assert [
+        json.loads(line)["pk"] for line in second.read_text().splitlines()
+    ] == [new.pk], (
+        "Убедитесь, что в инкрементальном режиме выгружаются только новые"
+        " записи."
+    )
+    export("comments", second, state=state)
+    assert second.read_text() == ""
+    assert json.loads(state.read_text())["blog.comment"]["id"] == new.pk
+
+
+@pytest.mark.django_db
+def test_incremental_export_uses_index_range(tmp_path, comments):
+    state = tmp_path / "state.json"
+    export("comments", tmp_path / "first.jsonl", state=state)
+    with CaptureQueriesContext(connection) as queries:
+        export("comments", tmp_path / "second.jsonl", state=state)
+    sql = queries[-1]["sql"]
+    assert '"blog_comment"."created_at" >= ' in sql.split(" OR ")[0], (
+        "Убедитесь, что к условию по ключу последней выгруженной записи"
+        " добавлена нестрогая граница по дате."
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+    assert "comment_created_idx (created_at>?)" in plan, (
+        "Убедитесь, что инкрементальная выгрузка ищет по диапазону индекса,"
+        f" а не просматривает его с начала: {plan}"
+    )
+
+
+@pytest.mark.django_db
+def test_admin_export_action(admin_client, comments):
+    response = admin_client.post("/admin/blog/comment/", {
+        "action": "export_csv",
+        "_selected_action": [comment.pk for comment in comments[:2]],
+    })
+    assert response.status_code == 200
+    assert response.streaming, (
+        "Убедитесь, что выгрузка из админки отдаётся потоком."
+    )
+    rows = list(csv.reader(
+        b"".join(response.streaming_content).decode().splitlines()))
+    assert len(rows) == 3
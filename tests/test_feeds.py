@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+
+@pytest.fixture
+def feed_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", title="Лента новостей", author=user,
+        category=published_category, is_published=True,
+        pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+@pytest.mark.django_db
+def test_feeds(unlogged_client: Client, feed_post, published_category, user):
+    for url, content_type in (
+        ("/feed/rss/", "application/rss+xml"),
+        ("/feed/atom/", "application/atom+xml"),
+        (f"/category/{published_category.slug}/rss/", "application/rss+xml"),
+        (f"/category/{published_category.slug}/atom/",
+         "application/atom+xml"),
+        (f"/profile/{user.username}/rss/", "application/rss+xml"),
+        (f"/profile/{user.username}/atom/", "application/atom+xml"),
+    ):
+        response = unlogged_client.get(url)
+        assert response.status_code == 200, url
+        assert response["Content-Type"].startswith(content_type), url
+        assert feed_post.title in response.content.decode(), (
+            f"Убедитесь, что лента `{url}` содержит новые публикации."
+        )
+    assert unlogged_client.get("/category/missing/rss/").status_code == 404
+
+
+@pytest.mark.django_db
+def test_feed_is_cached_and_conditional(
+        unlogged_client: Client, feed_post, django_assert_num_queries):
+    response = unlogged_client.get("/feed/rss/")
+    with django_assert_num_queries(0):
+        cached = unlogged_client.get("/feed/rss/")
+    assert cached.content == response.content, (
+        "Убедитесь, что лента отдаётся из кэша, пока публикации не менялись."
+    )
+    assert unlogged_client.get(
+        "/feed/rss/", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+    ).status_code == 304, (
+        "Убедитесь, что лента учитывает заголовок If-Modified-Since."
+    )
+    assert unlogged_client.get(
+        "/feed/rss/", HTTP_IF_NONE_MATCH=response["ETag"]
+    ).status_code == 304
+
+    feed_post.title = "Обновлённый заголовок"
+    feed_post.save()
+    response = unlogged_client.get(
+        "/feed/rss/", HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 200
+    assert "Обновлённый заголовок" in response.content.decode(), (
+        "Убедитесь, что после изменения публикации лента перестраивается."
+    )
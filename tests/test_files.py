@@ -0,0 +1,111 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+from django.core.files.images import ImageFile
+from django.http import Http404
+from django.test import RequestFactory
+
+from pages.files import serve
+
+CONTENT = bytes(range(256)) * 4
+HASHED = '0123456789abcdef' * 4 + '.jpg'
+
+
+@pytest.fixture
+def document_root(tmp_path):
+    (tmp_path / 'plain.jpg').write_bytes(CONTENT)
+    (tmp_path / HASHED).write_bytes(CONTENT)
+    return str(tmp_path)
+
+
+def get(document_root, name, **headers):
+    request = RequestFactory().get('/media/' + name, **headers)
+    return serve(request, name, document_root)
+
+
+def test_conditional_requests(document_root):
+    response = get(document_root, 'plain.jpg')
+    assert response.status_code == 200
+    assert b''.join(response.streaming_content) == CONTENT
+    assert response['Content-Length'] == str(len(CONTENT))
+    etag, last_modified = response['ETag'], response['Last-Modified']
+    assert get(
+        document_root, 'plain.jpg', HTTP_IF_NONE_MATCH=etag
+    ).status_code == 304, (
+        'Убедитесь, что при совпадении If-None-Match файл не отдаётся'
+        ' повторно.'
+    )
+    assert get(
+        document_root, 'plain.jpg', HTTP_IF_MODIFIED_SINCE=last_modified
+    ).status_code == 304, (
+        'Убедитесь, что If-Modified-Since учитывается при отдаче файлов.'
+    )
+
+
+@pytest.mark.parametrize('header, start, end', [
+    ('bytes=0-9', 0, 9),
+    ('bytes=1000-', 1000, 1023),
+    ('bytes=-24', 1000, 1023),
+    ('bytes=1020-5000', 1020, 1023),
+])
+def test_byte_ranges(document_root, header, start, end):
+    response = get(document_root, 'plain.jpg', HTTP_RANGE=header)
+    assert response.status_code == 206, (
+        'Убедитесь, что запрос с заголовком Range получает часть файла.'
+    )
+    assert b''.join(response.streaming_content) == CONTENT[start:end + 1]
+    assert response['Content-Length'] == str(end - start + 1)
+    assert response['Content-Range'] == (
+        f'bytes {start}-{end}/{len(CONTENT)}'
+    )
+
+
+def test_invalid_ranges(document_root):
+    response = get(document_root, 'plain.jpg', HTTP_RANGE='bytes=5000-')
+    assert response.status_code == 416
+    assert response['Content-Range'] == f'bytes */{len(CONTENT)}'
+    for header in ('bytes=0-1,5-6', 'items=0-1', 'bytes=9-1'):
+        response = get(document_root, 'plain.jpg', HTTP_RANGE=header)
+        assert response.status_code == 200, (
+            'Убедитесь, что неподдерживаемый заголовок Range игнорируется.'
+        )
+    response = get(
+        document_root, 'plain.jpg',
+        HTTP_RANGE='bytes=0-9', HTTP_IF_RANGE='"stale"'
+    )
+    assert response.status_code == 200, (
+        'Убедитесь, что при устаревшем If-Range файл отдаётся целиком.'
+    )
+
+
+def test_cache_control(document_root):
+    assert 'immutable' in get(document_root, HASHED)['Cache-Control'], (
+        'Убедитесь, что файлы с хэшем в имени кешируются навсегда.'
+    )
+    assert 'immutable' not in get(document_root, 'plain.jpg')[
+        'Cache-Control'
+    ]
+
+
+@pytest.mark.parametrize('name', ['missing.jpg', '../outside.jpg', '.'])
+def test_missing_files(document_root, name):
+    with pytest.raises(Http404):
+        get(document_root, name)
+
+
+@pytest.mark.django_db
+def test_media_url_served(client, mixer, user, published_category):
+    img_io = BytesIO()
+    Image.new("RGB", (40, 20)).save(img_io, format="JPEG")
+    post = mixer.blend(
+        "blog.Post",
+        category=published_category,
+        author=user,
+        image=ImageFile(img_io, name="served.jpg"),
+    )
+    response = client.get(post.image.url)
+    assert response.status_code == 200, (
+        'Убедитесь, что загруженные изображения доступны по MEDIA_URL.'
+    )
+    assert 'immutable' in response['Cache-Control']
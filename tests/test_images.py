@@ -0,0 +1,245 @@
+from io import BytesIO, StringIO
+
+import pytest
+from PIL import Image
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage
+from django.core.management import call_command
+from django.core.files.images import ImageFile
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import Client
+from django.utils import timezone
+
+from blog import images
+from blog.images import IMAGE_PLACEHOLDER, prepare_upload, rendition_name
+from blog.models import ImageTask, Post
+from blog.storage import post_image_storage
+from blog.tasks import claim_task, fail_task, run_pending
+
+
+@pytest.fixture
+def post_with_large_image(mixer, user, published_category):
+    img = Image.new("RGB", (1000, 500), color=(73, 109, 137))
+    img_io = BytesIO()
+    img.save(img_io, format="JPEG")
+    return mixer.blend(
+        "blog.Post",
+        category=published_category,
+        author=user,
+        image=ImageFile(img_io, name="large_image.jpg"),
+    )
+
+
+@pytest.mark.django_db
+def test_upload_queued_with_placeholder(
+        unlogged_client: Client, post_with_large_image
+):
+    post = post_with_large_image
+    post.refresh_from_db()
+    assert not post.image_ready and post.image_task.status == (
+        ImageTask.PENDING), (
+        "Убедитесь, что загруженное фото ставится в очередь обработки, а не"
+        " обрабатывается во время запроса."
+    )
+    assert IMAGE_PLACEHOLDER in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что пока фото обрабатывается, вместо него выводится"
+        " заглушка."
+    )
+
+
+@pytest.mark.django_db
+def test_renditions_generated_by_worker(post_with_large_image):
+    post = post_with_large_image
+    assert run_pending() == 1
+    post.refresh_from_db()
+    assert post.image_ready and post.image_task.status == ImageTask.DONE
+    assert post.image_renditions == "320,640,1000", (
+        "Убедитесь, что при загрузке фото создаются уменьшенные копии только"
+        " тех ширин, которые меньше исходной, и копия в полную ширину."
+    )
+    storage = post.image.storage
+    for width in (320, 640, 1000):
+        name = rendition_name(post.image.name, width)
+        assert storage.exists(name)
+        with storage.open(name) as file:
+            assert Image.open(file).width == width
+    assert storage.exists(post.image.name), (
+        "Убедитесь, что исходное фото сохраняется."
+    )
+
+
+@pytest.mark.django_db
+def test_card_uses_srcset_and_lazy_loading(
+        unlogged_client: Client, post_with_large_image
+):
+    run_pending()
+    content = unlogged_client.get("/").content.decode()
+    assert 'srcset="' in content and "320w" in content, (
+        "Убедитесь, что в карточке публикации для фото указан `srcset`."
+    )
+    assert "1000w" in content, (
+        "Убедитесь, что `srcset` содержит фото в полную ширину."
+    )
+    assert 'loading="lazy"' in content, (
+        "Убедитесь, что фото в карточках публикаций загружаются лениво."
+    )
+
+
+@pytest.mark.django_db
+def test_failed_task_retried_then_given_up(post_with_large_image):
+    post = post_with_large_image
+    for attempt in range(1, 4):
+        ImageTask.objects.filter(post=post).update(run_after=timezone.now())
+        task = claim_task()
+        assert task.attempts == attempt
+        fail_task(task, post, "Ошибка")
+    task.refresh_from_db()
+    post.refresh_from_db()
+    assert task.status == ImageTask.FAILED, (
+        "Убедитесь, что после исчерпания попыток задача помечается как"
+        " завершившаяся ошибкой."
+    )
+    assert post.image_ready and not post.image_renditions, (
+        "Убедитесь, что при ошибке обработки выводится исходное фото."
+    )
+
+
+@pytest.mark.django_db
+def test_transparent_renditions_on_white(mixer, user, published_category):
+    img_io = BytesIO()
+    Image.new("RGBA", (100, 50), color=(0, 0, 0, 0)).save(
+        img_io, format="PNG")
+    post = mixer.blend(
+        "blog.Post", category=published_category, author=user,
+        image=ImageFile(img_io, name="transparent.png"),
+    )
+    run_pending()
+    post.refresh_from_db()
+    with post.image.storage.open(rendition_name(post.image.name, 100)) as f:
+        pixel = Image.open(f).getpixel((50, 25))
+    assert min(pixel) > 240, (
+        "Убедитесь, что прозрачные участки фото в уменьшенных копиях"
+        " заливаются белым, а не чёрным."
+    )
+
+
+def make_upload(image, name, **save_kwargs):
+    buffer = BytesIO()
+    image.save(buffer, **save_kwargs)
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+def test_upload_downscaled_and_stripped():
+    exif = Image.Exif()
+    exif[0x010F] = "Камера"
+    upload = make_upload(
+        Image.new("RGB", (4000, 1000)), "big.png", format="PNG")
+    result = Image.open(prepare_upload(upload))
+    assert result.format == "JPEG" and result.size == (2560, 640), (
+        "Убедитесь, что слишком большие фото уменьшаются и перекодируются"
+        " в JPEG."
+    )
+    upload = make_upload(
+        Image.new("RGB", (100, 100)), "exif.jpg", format="JPEG", exif=exif)
+    assert not Image.open(prepare_upload(upload)).getexif(), (
+        "Убедитесь, что из загруженных фото удаляются данные EXIF."
+    )
+    upload = make_upload(
+        Image.new("RGBA", (100, 100)), "alpha.png", format="PNG")
+    assert Image.open(prepare_upload(upload)).format == "WEBP"
+
+
+def test_upload_limits(monkeypatch):
+    upload = make_upload(Image.new("RGB", (10, 10)), "img.bmp", format="BMP")
+    with pytest.raises(ValidationError):
+        prepare_upload(upload)
+    monkeypatch.setattr(images, "IMAGE_MAX_PIXELS", 50)
+    upload = make_upload(Image.new("RGB", (10, 10)), "img.png", format="PNG")
+    with pytest.raises(ValidationError):
+        prepare_upload(upload)
+    monkeypatch.setattr(images, "IMAGE_MAX_UPLOAD_SIZE", 10)
+    with pytest.raises(ValidationError):
+        prepare_upload(upload)
+
+
+@pytest.fixture
+def jpeg_bytes():
+    buffer = BytesIO()
+    Image.new("RGB", (50, 50), color=(10, 20, 30)).save(buffer, "JPEG")
+    return buffer.getvalue()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_identical_uploads_stored_once(mixer, user, jpeg_bytes):
+    first, second = mixer.cycle(2).blend(
+        "blog.Post", author=user,
+        image=mixer.sequence(
+            *(ImageFile(BytesIO(jpeg_bytes), name=f"copy_{i}.jpg")
+              for i in range(2))),
+    )
+    assert first.image.name == second.image.name, (
+        "Убедитесь, что одинаковые фото хранятся в одном файле."
+    )
+    storage = first.image.storage
+    first.delete()
+    assert storage.exists(second.image.name), (
+        "Убедитесь, что при удалении публикации не удаляется фото, на"
+        " которое ссылаются другие публикации."
+    )
+    second.delete()
+    assert not storage.exists(second.image.name), (
+        "Убедитесь, что при удалении последней публикации с фото файл"
+        " удаляется."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_release_rechecks_references_before_delete(
+        mixer, user, jpeg_bytes, monkeypatch):
+    first, second = mixer.cycle(2).blend("blog.Post", author=user)
+    first.image = ImageFile(BytesIO(jpeg_bytes), name="race.jpg")
+    first.save()
+    run_pending()
+    name = first.image.name
+    Post.objects.filter(pk=first.pk).update(image="")
+    delete = post_image_storage.delete
+
+    def delete_while_reused(path):
+        # Пока удаляются копии, другая публикация начинает ссылаться на фото.
+        Post.objects.filter(pk=second.pk).update(image=name)
+        delete(path)
+
+    monkeypatch.setattr(post_image_storage, "delete", delete_while_reused)
+    assert not images.release_image(name)
+    assert post_image_storage.exists(name), (
+        "Убедитесь, что перед удалением исходного фото ссылки на него"
+        " проверяются ещё раз."
+    )
+    monkeypatch.setattr(post_image_storage, "delete", delete)
+    Post.objects.filter(pk=second.pk).update(image="")
+    assert images.release_image(name)
+    assert not post_image_storage.exists(rendition_name(name, 50)) and (
+        not post_image_storage.exists(name)), (
+        "Убедитесь, что фото без ссылок удаляется вместе с копиями."
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dedupe_images_command(mixer, user, jpeg_bytes):
+    storage = post_image_storage
+    names = [
+        FileSystemStorage.save(storage, f"article_images/old_{i}.jpg",
+                               ContentFile(jpeg_bytes))
+        for i in range(2)
+    ]
+    posts = mixer.cycle(2).blend("blog.Post", author=user)
+    for post, name in zip(posts, names):
+        Post.objects.filter(pk=post.pk).update(image=name)
+    call_command("dedupe_images", stdout=StringIO())
+    new_names = set(Post.objects.values_list("image", flat=True))
+    assert len(new_names) == 1, (
+        "Убедитесь, что команда `dedupe_images` объединяет одинаковые фото."
+    )
+    assert storage.exists(new_names.pop())
+    assert not any(storage.exists(name) for name in names)
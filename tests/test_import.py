@@ -0,0 +1,116 @@
+import gzip
+import json
+from io import StringIO
+
+import pytest
+from django.core.management import CommandError, call_command
+
+from blog.models import Category, Comment, Location, Post
+from blog.search import search
+from blog.streaming import read_json_array
+
+CREATED_AT = "2022-12-18T23:03:52.159Z"
+
+
+@pytest.fixture
+def records(user):
+    return [
+        {"model": "auth.permission", "pk": 1, "fields": {}},
+        {"model": "blog.category", "pk": 101, "fields": {
+            "title": "Импорт", "slug": "import", "description": "Описание",
+            "is_published": True, "created_at": CREATED_AT}},
+        {"model": "blog.location", "pk": 102, "fields": {
+            "name": "Остров", "is_published": True,
+            "created_at": CREATED_AT}},
+        {"model": "blog.post", "pk": 103, "fields": {
+            "title": "Импортированные котики", "text": "Текст",
+            "pub_date": CREATED_AT, "author": user.id, "category": 101,
+            "location": 102, "is_published": True,
+            "created_at": CREATED_AT}},
+        {"model": "blog.post", "pk": 104, "fields": {
+            "title": "Вторая", "text": "Текст", "pub_date": CREATED_AT,
+            "author": [user.username], "category": 999, "location": None,
+            "is_published": True, "created_at": CREATED_AT}},
+        {"model": "blog.post", "pk": 105, "fields": {
+            "title": "Без автора", "text": "Текст", "pub_date": CREATED_AT,
+            "author": 999, "category": 101, "is_published": True}},
+        {"model": "blog.comment", "pk": 106, "fields": {
+            "text": "Комментарий", "post": 103, "author": user.id,
+            "created_at": CREATED_AT}},
+        {"model": "blog.comment", "pk": 107, "fields": {
+            "text": "К чужой публикации", "post": 105, "author": user.id}},
+    ]
+
+
+def run_import(*paths):
+    out = StringIO()
+    call_command("import_blog", *map(str, paths), batch_size=2, stdout=out)
+    return out.getvalue()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("name", ["dump.json", "dump.jsonl", "dump.jsonl.gz"])
+def test_import(tmp_path, records, name):
+    path = tmp_path / name
+    opener = gzip.open if name.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as file:
+        if ".jsonl" in name:
+            file.writelines(json.dumps(record) + "\n" for record in records)
+        else:
+            json.dump(records, file, ensure_ascii=False, indent=2)
+    output = run_import(path)
+    assert "записей/с" in output, (
+        "Убедитесь, что команда импорта сообщает скорость загрузки."
+    )
+    assert set(Post.objects.values_list("pk", flat=True)) == {103, 104}, (
+        "Убедитесь, что публикации с несуществующим автором пропускаются."
+    )
+    assert Category.objects.get(pk=101).created_at.year == 2022, (
+        "Убедитесь, что импорт сохраняет даты создания из выгрузки."
+    )
+    assert Location.objects.filter(pk=102).exists()
+    assert Post.objects.get(pk=104).category is None
+    assert list(Comment.objects.values_list("pk", flat=True)) == [106]
+    assert Post.objects.get(pk=103).comment_count == 1, (
+        "Убедитесь, что после импорта пересчитывается число комментариев."
+    )
+    assert search(Post.objects.all(), "котики").get().pk == 103
+
+    run_import(path)
+    assert Post.objects.count() == 2, (
+        "Убедитесь, что повторный импорт не создаёт дубликатов."
+    )
+
+
+def test_read_json_array(monkeypatch):
+    monkeypatch.setattr("blog.streaming.READ_CHUNK_SIZE", 3)
+    text = ' [ {"a": "]},["}, {"b": [1, 2]} ] '
+    assert list(read_json_array(StringIO(text))) == [
+        {"a": "]},["}, {"b": [1, 2]}
+    ]
+    with pytest.raises(ValueError):
+        list(read_json_array(StringIO('[{"a": 1}, {"b"')))
+    with pytest.raises(ValueError):
+        list(read_json_array(StringIO('{"a": 1}')))
+
+
+@pytest.mark.django_db
+def test_import_missing_file(tmp_path):
+    with pytest.raises(CommandError):
+        run_import(tmp_path / "missing.json")
+
+
+@pytest.mark.django_db
+def test_import_recounts_only_commented_posts(
+        tmp_path, records, mixer, user):
+    other = mixer.blend("blog.Post", author=user, comment_count=5)
+    path = tmp_path / "dump.jsonl"
+    path.write_text(
+        "".join(json.dumps(record) + "\n" for record in records),
+        encoding="utf-8")
+    run_import(path)
+    assert Post.objects.get(pk=103).comment_count == 1
+    assert Post.objects.get(pk=other.pk).comment_count == 5, (
+        "Убедитесь, что импорт пересчитывает комментарии только у"
+        " публикаций, к которым они добавлены, а не по всей таблице."
+    )
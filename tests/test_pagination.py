@@ -0,0 +1,100 @@
+from http import HTTPStatus
+
+import pytest
+from django.core.paginator import Paginator
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from blog.paginators import CappedPaginator, cursor_page, page_window
+from conftest import N_PER_PAGE
+
+
+@pytest.mark.django_db
+def test_cursor_pages_walk_whole_feed(
+        monkeypatch, unlogged_client: Client,
+        many_posts_with_published_locations
+):
+    monkeypatch.setattr(CappedPaginator, "max_pages", 1)
+    response = unlogged_client.get("/")
+    first_page = list(response.context["page_obj"])
+    next_cursor = response.context["page_obj"].next_cursor
+    assert f"?after={next_cursor}" in response.content.decode(), (
+        "Убедитесь, что на последней нумерованной странице выводится ссылка"
+        " на следующую страницу по курсору."
+    )
+    assert unlogged_client.get("/?page=2").status_code == (
+        HTTPStatus.NOT_FOUND), (
+        "Убедитесь, что нумерованные страницы глубже `PAGINATE_MAX_PAGE`"
+        " возвращают ошибку 404."
+    )
+
+    with CaptureQueriesContext(connection) as queries:
+        response = unlogged_client.get(f"/?after={next_cursor}")
+    second_page = list(response.context["page_obj"])
+    assert len(queries) == 1, (
+        "Убедитесь, что страница по курсору загружается одним запросом, без"
+        " подсчёта общего количества публикаций."
+    )
+    assert len(second_page) == N_PER_PAGE
+    assert not set(first_page) & set(second_page)
+    assert not response.context["page_obj"].has_next()
+
+    previous_cursor = response.context["page_obj"].previous_cursor
+    response = unlogged_client.get(f"/?before={previous_cursor}")
+    assert list(response.context["page_obj"]) == first_page, (
+        "Убедитесь, что ссылка на предыдущую страницу по курсору возвращает"
+        " предыдущие публикации в том же порядке."
+    )
+
+
+@pytest.mark.django_db
+@pytest.mark.django_db
+@pytest.mark.parametrize("cursor", [
+    "abc",
+    "999999999999999999999_1",
+    "1_99999999999999999999999",
+])
+def test_bad_cursor_returns_404(
+        unlogged_client: Client, post_with_published_location, cursor):
+    post = post_with_published_location
+    for url in ("/", "/api/posts/", f"/posts/{post.id}/"):
+        assert unlogged_client.get(url, {"after": cursor}).status_code == (
+            HTTPStatus.NOT_FOUND), (
+            f"Убедитесь, что некорректный курсор `{cursor}` на странице"
+            f" `{url}` даёт ошибку 404, а не 500."
+        )
+
+
+def test_page_window_is_bounded():
+    paginator = Paginator(range(100000), N_PER_PAGE)
+    for number in (1, 5000, paginator.num_pages):
+        window = list(page_window(paginator.page(number)))
+        assert number in window
+        assert len(window) <= 9, (
+            "Убедитесь, что пагинатор выводит ограниченное окно номеров"
+            " страниц вокруг текущей, а не все страницы ленты."
+        )
+
+
+@pytest.mark.django_db
+def test_cursor_page_uses_index_range(mixer, user):
+    mixer.cycle(5).blend("blog.Post", author=user)
+    queryset = Post.objects.filter(author=user)
+    first = cursor_page(queryset, 2)
+    with CaptureQueriesContext(connection) as queries:
+        cursor_page(queryset, 2, after=first.next_cursor)
+    sql = queries[0]["sql"]
+    assert '"blog_post"."pub_date" <= ' in sql.split(" OR ")[0], (
+        "Убедитесь, что к условию по курсору добавлена нестрогая граница"
+        " по дате: по условию с OR SQLite не может искать в диапазоне"
+        " индекса."
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        plan = " ".join(row[-1] for row in cursor.fetchall())
+    assert "post_author_feed_idx (author_id=? AND pub_date<?)" in plan, (
+        "Убедитесь, что страница по курсору ищет по диапазону индекса, а не"
+        f" просматривает его с начала: {plan}"
+    )
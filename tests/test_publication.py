@@ -0,0 +1,43 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from blog.utils import publication_bucket, publication_now
+
+
+@pytest.mark.django_db
+def test_scheduled_post_goes_live_without_restart(
+        mixer, monkeypatch, unlogged_client: Client, published_category
+):
+    real_now = timezone.now()
+    post = mixer.blend(
+        "blog.Post", category=published_category,
+        pub_date=real_now + timedelta(minutes=5),
+    )
+    assert post.title not in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что отложенная публикация не отображается на главной"
+        " странице до наступления даты публикации."
+    )
+    assert unlogged_client.get(f"/posts/{post.id}/").status_code == 404
+
+    monkeypatch.setattr(
+        timezone, "now", lambda: real_now + timedelta(minutes=10))
+    assert post.title in unlogged_client.get("/").content.decode(), (
+        "Убедитесь, что отложенная публикация появляется на главной странице"
+        " после наступления даты публикации без перезапуска сервера."
+    )
+    assert unlogged_client.get(f"/posts/{post.id}/").status_code == 200
+
+
+def test_publication_now_is_stable_within_bucket(monkeypatch):
+    start = publication_now() + timedelta(minutes=1)
+    monkeypatch.setattr(timezone, "now", lambda: start)
+    bucket = publication_bucket()
+    monkeypatch.setattr(timezone, "now", lambda: start + timedelta(seconds=59))
+    assert publication_bucket() == bucket, (
+        "Убедитесь, что в пределах одного шага `PUBLICATION_TIME_STEP`"
+        " текущее время для отбора публикаций не меняется."
+    )
+    assert publication_now() == start
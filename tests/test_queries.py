@@ -0,0 +1,111 @@
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from blog.models import Post
+from conftest import N_PER_PAGE
+
+
+@pytest.fixture
+def commented_posts(mixer, many_posts_with_published_locations):
+    for post in many_posts_with_published_locations:
+        mixer.cycle(3).blend("blog.Comment", post=post)
+    return many_posts_with_published_locations
+
+
+@pytest.mark.parametrize(
+    ("url_name", "expected_queries"),
+    [("index", 2), ("category", 3), ("profile", 2)],
+)
+@pytest.mark.django_db
+def test_feed_pages_load_only_card_data(
+        unlogged_client: Client, commented_posts, url_name, expected_queries
+):
+    post = commented_posts[0]
+    url = {
+        "index": "/",
+        "category": f"/category/{post.category.slug}/",
+        "profile": f"/profile/{post.author.username}/",
+    }[url_name]
+    with CaptureQueriesContext(connection) as queries:
+        response = unlogged_client.get(url)
+    assert len(queries) == expected_queries, (
+        f"Убедитесь, что страница `{url}` загружается за {expected_queries}"
+        f" запроса к базе данных, а не за {len(queries)}."
+    )
+    assert not any('"blog_comment"' in q["sql"] for q in queries), (
+        "Убедитесь, что на страницах со списком публикаций не загружаются"
+        " комментарии: карточке поста нужен только их счётчик."
+    )
+    assert len(response.context["page_obj"]) == N_PER_PAGE, (
+        f"Убедитесь, что на странице `{url}` выводится {N_PER_PAGE}"
+        " публикаций."
+    )
+
+
+@pytest.mark.django_db
+def test_post_detail_loads_post_once(
+        unlogged_client: Client, comment_to_a_post, django_assert_num_queries
+):
+    post_id = comment_to_a_post.post_id
+    # Публикация с автором, категорией и местоположением + комментарии.
+    with django_assert_num_queries(2):
+        response = unlogged_client.get(f"/posts/{post_id}/")
+    assert response.status_code == 200, (
+        "Убедитесь, что опубликованная публикация отображается на своей"
+        " странице."
+    )
+
+
+@pytest.mark.django_db
+def test_edit_pages_fetch_object_once(
+        user, user_client: Client, comment_to_a_post
+):
+    comment_to_a_post.author = user
+    comment_to_a_post.save()
+    post = comment_to_a_post.post
+    post.author = user
+    post.save()
+    urls = (
+        f"/posts/{post.id}/edit_comment/{comment_to_a_post.id}",
+        f"/posts/{post.id}/delete_comment/{comment_to_a_post.id}",
+        f"/posts/{post.id}/edit/",
+        f"/posts/{post.id}/delete/",
+    )
+    for url in urls:
+        with CaptureQueriesContext(connection) as queries:
+            response = user_client.get(url)
+        assert response.status_code == 200
+        object_queries = [
+            q for q in queries
+            if '"blog_comment"' in q["sql"] or '"blog_post"' in q["sql"]
+        ]
+        assert len(object_queries) == 1, (
+            f"Убедитесь, что на странице `{url}` редактируемый объект"
+            " загружается из базы данных один раз, вместе с автором."
+        )
+
+
+@pytest.mark.django_db
+def test_explain_feeds_compares_plans(mixer, user):
+    mixer.blend("blog.Post", author=user, category=None)
+    posts = Post.objects.count()
+    out = StringIO()
+    call_command("explain_feeds", seed=30, repeat=1, stdout=out)
+    assert Post.objects.count() == posts, (
+        "Убедитесь, что тестовые публикации `explain_feeds --seed` удаляются"
+        " после замеров."
+    )
+    output = out.getvalue()
+    before, after = output.split("С индексами лент")
+    assert "Без индексов лент" in before and (
+        "post_published_feed_idx" not in before), (
+        "Убедитесь, что план «до» снимается без индексов лент."
+    )
+    assert "post_published_feed_idx" in after, (
+        "Убедитесь, что после сравнения индексы лент восстанавливаются."
+    )
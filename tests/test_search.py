@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+import pytest
+from django.test import Client
+from django.utils import timezone
+
+from blog.models import Post
+from blog.search import match_expression, rebuild_index, search
+
+
+@pytest.fixture
+def make_post(mixer, user, published_category):
+    def make(title, text="Текст"):
+        return mixer.blend(
+            "blog.Post", title=title, text=text, author=user,
+            category=published_category, is_published=True,
+            pub_date=timezone.now() - timedelta(days=1),
+        )
+    return make
+
+
+def found(query):
+    return list(search(Post.objects.all(), query).values_list(
+        "title", flat=True))
+
+
+def test_match_expression_stems_words():
+    assert match_expression("Котами, КОТЫ!") == '"кот" "кот"'
+    assert match_expression(" ,.") == ""
+
+
+@pytest.mark.django_db
+def test_search_uses_russian_stemming(make_post):
+    make_post("Про котов", "Коты любят спать.")
+    make_post("Про собак", "Собаки любят гулять.")
+    assert found("кошачий кот") == [], (
+        "Убедитесь, что в результатах поиска есть все слова запроса."
+    )
+    assert found("котами") == ["Про котов"], (
+        "Убедитесь, что поиск находит другие формы слова."
+    )
+
+
+@pytest.mark.django_db
+def test_search_ranks_title_matches_first(make_post):
+    make_post("Дневник", "Сегодня видел ежа.")
+    make_post("Ежи в тумане", "Сегодня тихо.")
+    assert found("ёж") == ["Ежи в тумане", "Дневник"], (
+        "Убедитесь, что совпадения в заголовке ранжируются выше."
+    )
+
+
+@pytest.mark.django_db
+def test_index_follows_edits_and_deletes(make_post):
+    post = make_post("Старый заголовок")
+    post.title = "Новый заголовок"
+    post.save()
+    assert found("старый") == [] and found("новый") == [post.title], (
+        "Убедитесь, что индекс обновляется при редактировании публикации."
+    )
+    post.delete()
+    assert found("новый") == [], (
+        "Убедитесь, что удалённые публикации пропадают из поиска."
+    )
+
+
+@pytest.mark.django_db
+def test_rebuild_index(make_post):
+    post = make_post("Заголовок")
+    Post.objects.filter(pk=post.pk).update(title="Переименовано")
+    assert rebuild_index() == 1
+    assert found("переименовано") == ["Переименовано"]
+
+
+@pytest.mark.django_db
+def test_search_page(make_post, mixer, unlogged_client: Client):
+    hidden = make_post("Скрытая заметка")
+    Post.objects.filter(pk=hidden.pk).update(is_published=False)
+    for number in range(12):
+        make_post(f"Заметка {number}")
+    response = unlogged_client.get("/search/", {"q": "заметки"})
+    assert response.status_code == 200
+    page = response.context["page_obj"]
+    assert page.paginator.count == 12, (
+        "Убедитесь, что поиск показывает только опубликованные публикации."
+    )
+    assert len(page.object_list) == 10
+    assert "?q=%D0%B7%D0%B0%D0%BC%D0%B5%D1%82%D0%BA%D0%B8&amp;page=2" in (
+        response.content.decode()
+    ), "Убедитесь, что ссылки пагинации сохраняют поисковый запрос."
+    empty = unlogged_client.get("/search/")
+    assert empty.status_code == 200
+    assert not empty.context["page_obj"].object_list
+
+
+@pytest.mark.django_db
+def test_header_links_to_search(unlogged_client: Client):
+    content = unlogged_client.get("/").content.decode()
+    assert 'href="/search/"' in content, (
+        "Убедитесь, что в шапке сайта есть ссылка на страницу поиска."
+    )
@@ -0,0 +1,99 @@
+from datetime import timedelta
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.urls import resolve
+from django.utils import timezone
+
+from blog.models import SitemapShard
+from blog.sitemaps import build_sitemaps, shard_number
+from pages.files import serve
+
+BASE_URL = 'https://blogicum.example'
+
+
+@pytest.fixture
+def small_shards(monkeypatch):
+    monkeypatch.setattr('blog.config.SITEMAP_SHARD_SIZE', 2)
+
+
+@pytest.fixture
+def posts(mixer, user, published_category, small_shards):
+    return mixer.cycle(3).blend(
+        'blog.Post', author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(hours=1),
+    )
+
+
+def rebuilt_names(tmp_path):
+    return {shard.filename for shard in build_sitemaps(tmp_path, BASE_URL)}
+
+
+@pytest.mark.django_db
+def test_build_writes_index_and_shards(tmp_path, posts, user, settings):
+    settings.SITEMAP_ROOT = tmp_path
+    out = StringIO()
+    call_command('build_sitemaps', '--full', '--base-url', BASE_URL,
+                 stdout=out)
+    assert 'Перестроено' in out.getvalue()
+    index = (tmp_path / 'sitemap.xml').read_text()
+    shard = f'sitemap-posts-{shard_number(posts[0].pk)}.xml'
+    assert f'{BASE_URL}/{shard}' in index, (
+        'Убедитесь, что индекс карты сайта ссылается на её части.'
+    )
+    urls = ''.join(path.read_text() for path in tmp_path.glob('sitemap-*'))
+    for post in posts:
+        assert f'{BASE_URL}/posts/{post.pk}/' in urls
+    assert f'{BASE_URL}/profile/{user.username}/' in urls
+    assert 'sitemap-categories-0.xml' in index
+
+
+@pytest.mark.django_db
+def test_only_changed_shards_are_rebuilt(tmp_path, posts):
+    build_sitemaps(tmp_path, BASE_URL)
+    assert rebuilt_names(tmp_path) == set(), (
+        'Убедитесь, что без изменений части карты сайта не перестраиваются.'
+    )
+    posts[0].title = 'Новый заголовок'
+    posts[0].save()
+    rebuilt = rebuilt_names(tmp_path)
+    assert f'sitemap-posts-{shard_number(posts[0].pk)}.xml' in rebuilt
+    assert f'sitemap-posts-{shard_number(posts[2].pk)}.xml' not in rebuilt, (
+        'Убедитесь, что перестраиваются только части с изменёнными'
+        ' публикациями.'
+    )
+
+
+@pytest.mark.django_db
+def test_hidden_post_leaves_sitemap(tmp_path, posts):
+    build_sitemaps(tmp_path, BASE_URL)
+    posts[0].is_published = False
+    posts[0].save()
+    build_sitemaps(tmp_path, BASE_URL)
+    urls = ''.join(path.read_text() for path in tmp_path.glob('sitemap-*'))
+    assert f'/posts/{posts[0].pk}/' not in urls
+    assert f'/posts/{posts[1].pk}/' in urls
+
+
+@pytest.mark.django_db
+def test_scheduled_post_going_live_rebuilds_shard(tmp_path, posts):
+    build_sitemaps(tmp_path, BASE_URL)
+    now = timezone.now()
+    SitemapShard.objects.update(
+        changed_at=now - timedelta(hours=3),
+        generated_at=now - timedelta(hours=2))
+    assert f'sitemap-posts-{shard_number(posts[0].pk)}.xml' in rebuilt_names(
+        tmp_path), (
+        'Убедитесь, что наступление даты публикации перестраивает часть'
+        ' карты сайта.'
+    )
+
+
+def test_sitemap_urls():
+    for path in ('sitemap.xml', 'sitemap-posts-12.xml'):
+        match = resolve('/' + path)
+        assert match.func is serve, (
+            'Убедитесь, что карта сайта отдаётся из корня сайта.'
+        )
+        assert match.kwargs['path'] == path